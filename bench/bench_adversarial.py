@@ -0,0 +1,55 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from inline import text_to_textnodes
+
+# Inputs that make backtracking or rescanning parsers quadratic: long runs of openers
+# that never close, closers with no opener, and interleaved delimiters of both kinds.
+CASES = {
+    "unmatched * openers": "*a ",
+    "unmatched _ openers": "_a ",
+    "unmatched closers": "a* ",
+    "interleaved *_": "*a _b ",
+    "rule of three": "a**b*c ",
+    "open brackets": "[a *b ",
+}
+
+
+def text_for(case, size):
+    unit = CASES[case]
+    return unit * (size // len(unit))
+
+
+def best_of(text, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text_to_textnodes(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="text_to_textnodes time on adversarial inputs of growing size.")
+    parser.add_argument("--max-size", type=int, default=256_000)
+    args = parser.parse_args()
+
+    sizes = []
+    size = 4_000
+    while size <= args.max_size:
+        sizes.append(size)
+        size *= 4
+    print(f"{'case':<22}" + "".join(f"{size:>10}" for size in sizes) + f"{'growth':>9}")
+    for case in CASES:
+        times = [best_of(text_for(case, size)) for size in sizes]
+        # Time ratio per 4x more input: about 4 when linear, about 16 when quadratic.
+        growth = (times[-1] / times[0]) ** (1 / max(1, len(times) - 1))
+        print(f"{case:<22}" + "".join(f"{t * 1000:>8.1f}ms" for t in times) + f"{growth:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blocks import markdown_to_html_node, render_many
+from corpus import WORDS
+
+
+def snippets(count, unique, seed=0):
+    # Short comment-like inputs; `unique` distinct snippets are repeated to fill count.
+    rng = random.Random(seed)
+    def snippet():
+        word = rng.choice(WORDS)
+        return rng.choice([
+            f"Thanks, this **{word}** helped!",
+            f"See [{word}](https://example.com/{word}) for _details_.",
+            f"Try `{word}()` instead.",
+            f"- {word}\n- {rng.choice(WORDS)}",
+            " ".join(rng.choice(WORDS) for _ in range(8)),
+        ])
+    pool = [snippet() for _ in range(unique)]
+    return [pool[i % unique] for i in range(count)]
+
+
+def measure(label, func, inputs, baseline=None):
+    start = time.perf_counter()
+    total = 0
+    for html in func(inputs):
+        total += len(html)
+    elapsed = time.perf_counter() - start
+    rate = len(inputs) / elapsed
+    speedup = f"{rate / baseline:.2f}x" if baseline else ""
+    print(f"{label:<28} {elapsed:>8.2f}s {rate:>12,.0f}/s {speedup:>7}")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snippets per second for render_many vs one call per snippet.")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--unique", type=int, default=None, help="distinct snippets (default: all distinct)")
+    args = parser.parse_args()
+
+    inputs = snippets(args.count, args.unique or args.count)
+    baseline = measure("markdown_to_html_node loop", lambda items: (markdown_to_html_node(md).to_html() for md in items), inputs)
+    measure("render_many", render_many, inputs, baseline)
+    measure("render_many(dedupe=True)", lambda items: render_many(items, dedupe=True), inputs, baseline)
+
+
+if __name__ == "__main__":
+    main()
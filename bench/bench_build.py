@@ -0,0 +1,59 @@
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from build import build_site
+
+PAGE = """# Page {n}
+
+Some prose about page {n} with **bold**, _italic_ and `code`, plus a
+[link](/section-{section}/page-{prev}.html) to the previous page.
+
+- first item
+- second item
+
+> A short quote
+"""
+
+
+def make_site(root, pages):
+    content = os.path.join(root, "content")
+    static = os.path.join(root, "static")
+    os.makedirs(static)
+    with open(os.path.join(static, "styles.css"), "w") as fp:
+        fp.write("body { margin: 0 auto; }\n")
+    template = os.path.join(root, "template.html")
+    with open(template, "w") as fp:
+        fp.write("<html><title>{{ Title }}</title><body>{{ Content }}</body></html>")
+    for n in range(pages):
+        section = os.path.join(content, f"section-{n // 1000}")
+        os.makedirs(section, exist_ok=True)
+        with open(os.path.join(section, f"page-{n}.md"), "w") as fp:
+            fp.write(PAGE.format(n=n, section=n // 1000, prev=max(n - 1, 0)))
+    return content, static, template, os.path.join(root, "site")
+
+
+def report(label, result):
+    print(f"{label:<18} {result.elapsed:>8.2f}s  rendered {len(result.rendered):>6}  skipped {result.skipped:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time clean, no-op and one-page incremental builds.")
+    parser.add_argument("--pages", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        content, static, template, dest = make_site(root, args.pages)
+        report("clean build", build_site(content, static, template, dest, args.workers, clean=True))
+        report("no-op rebuild", build_site(content, static, template, dest, args.workers))
+        with open(os.path.join(content, "section-0", "page-0.md"), "a") as fp:
+            fp.write("\nA one-line typo fix.\n")
+        report("one-page edit", build_site(content, static, template, dest, args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blocks import BlockType, block_to_block_type
+
+
+def if_chain_block_to_block_type(block):
+    # The previous classifier: an if/elif chain with one f-string per ordered-list line.
+    if block.startswith("#"):
+        return BlockType.HEADING
+    elif block.startswith("```\n") and block.endswith("```"):
+        return BlockType.CODE
+    elif block.startswith(">"):
+        return BlockType.QUOTE
+    elif block.startswith("- "):
+        return BlockType.UNORDERED_LIST
+    elif block[0].isdigit() and block.startswith(". ", 1):
+        if len(block.split("\n")) > 1:
+            lines = block.split("\n")
+            for i, line in enumerate(lines):
+                if not line.startswith(f"{i + 1}. "):
+                    return BlockType.PARAGRAPH
+        return BlockType.ORDERED_LIST
+    else:
+        return BlockType.PARAGRAPH
+
+
+CASES = {
+    "ordered list, 100k items": "\n".join(f"{i}. item number {i}" for i in range(1, 100_001)),
+    "unordered list, 100k items*": "\n".join(f"- item number {i}" for i in range(100_000)),
+    "quote, 100k lines*": "\n".join(f"> quoted line {i}" for i in range(100_000)),
+    "paragraph": "Just a paragraph of text that does not start with a marker.",
+    "heading": "## A heading",
+}
+
+
+def best_of(func, block, loops, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func(block)
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+
+def main():
+    # The if-chain only looked at the first line of quotes and unordered lists;
+    # the dispatch classifier validates every line, so those rows are not like for like.
+    print(f"{'block':<28} {'if-chain':>12} {'dispatch':>12} {'speedup':>8}")
+    for label, block in CASES.items():
+        loops = 1 if len(block) > 1000 else 20_000
+        old = best_of(if_chain_block_to_block_type, block, loops)
+        new = best_of(block_to_block_type, block, loops)
+        print(f"{label:<28} {old * 1e6:>10.1f}us {new * 1e6:>10.1f}us {old / new:>7.1f}x")
+    print("* validated on every line now; the if-chain checked only the first line")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blocks import markdown_to_html_node
+
+BLOCK = """## Section {n}
+
+Some prose with **bold**, _italic_, `code` and a [link](https://www.boot.dev/{n}).
+
+- item with ![icon](/img/{n}.png)
+- another item
+
+> quoted text"""
+
+
+def measure(label, markdown, compact):
+    # Timed without tracing first, since tracemalloc slows every allocation.
+    start = time.perf_counter()
+    markdown_to_html_node(markdown, compact=compact)
+    build = time.perf_counter() - start
+    tracemalloc.start()
+    document = markdown_to_html_node(markdown, compact=compact)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    document.to_html()
+    emit = time.perf_counter() - start
+    print(f"{label:<10} {build:>8.2f}s {retained / 1_000_000:>10.1f} MB {emit:>8.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the HTMLNode tree with the compact document.")
+    parser.add_argument("--blocks", type=int, default=20_000)
+    args = parser.parse_args()
+
+    markdown = "\n\n".join(BLOCK.format(n=n) for n in range(args.blocks))
+    print(f"{'':<10} {'build':>9} {'retained':>13} {'to_html':>9}")
+    measure("tree", markdown, compact=False)
+    measure("compact", markdown, compact=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import htmlnode
+from htmlnode import LeafNode, ParentNode
+
+
+def concat_format_props(props):
+    # The previous format_props: += per attribute, no escaping, no caching.
+    if props is None:
+        return ""
+    props_html = ""
+    for prop in props:
+        props_html += f' {prop}="{props[prop]}"'
+    return props_html
+
+
+def gallery(tags):
+    # A page of linked thumbnails: half <a>, half <img>, with a few hundred distinct URLs.
+    items = []
+    for i in range(tags // 2):
+        name = f"photo-{i % 500}"
+        items.append(ParentNode("li", [
+            LeafNode("a", f"Photo {i} & friends", {"href": f"/gallery/{name}.html"}),
+            LeafNode("img", "", {"src": f"/images/{name}.jpg", "alt": f"Photo {i % 500}"}),
+        ]))
+    return ParentNode("ul", items)
+
+
+def measure(label, page, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        html = page.to_html()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<34} {best:>8.3f}s {len(html):>12,} chars")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serialize a page with many <a>/<img> tags.")
+    parser.add_argument("--tags", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    page = gallery(args.tags)
+    current = measure("escaped, cached attributes", page, args.repeat)
+    formatted = htmlnode.format_props
+    htmlnode.format_props = concat_format_props
+    try:
+        previous = measure("unescaped attributes, += (previous)", page, args.repeat)
+    finally:
+        htmlnode.format_props = formatted
+    print(f"speedup: {previous / current:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
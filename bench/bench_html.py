@@ -0,0 +1,75 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from htmlnode import LeafNode, ParentNode
+
+
+def recursive_to_html(node):
+    # The previous ParentNode.to_html: one join and f-string per nesting level.
+    if isinstance(node, ParentNode):
+        inner = "".join([recursive_to_html(child) for child in node.children])
+        return f"<{node.tag}{node.props_to_html()}>{inner}</{node.tag}>"
+    return node.to_html()
+
+
+def document(megabytes):
+    section = ParentNode("section", [
+        ParentNode("h2", [LeafNode(None, "Section heading")]),
+        ParentNode("p", [
+            LeafNode(None, "Some prose with "),
+            LeafNode("b", "bold"),
+            LeafNode(None, " text and a "),
+            LeafNode("a", "link", {"href": "https://www.boot.dev"}),
+            LeafNode(None, ". " * 40),
+        ]),
+        ParentNode("blockquote", [ParentNode("ul", [
+            ParentNode("li", [LeafNode(None, "item one")]),
+            ParentNode("li", [LeafNode("code", "item two")]),
+        ])]),
+    ])
+    size = len(section.to_html())
+    return ParentNode("div", [section] * (megabytes * 1_000_000 // size))
+
+
+def measure(label, func):
+    # Timed without tracing first, since tracemalloc slows every allocation.
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed:>8.2f}s {peak / 1_000_000:>10.1f} MB peak")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare HTML serializers on a large document.")
+    parser.add_argument("--mb", type=int, default=50, help="approximate document size in MB")
+    args = parser.parse_args()
+
+    root = document(args.mb)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "out.html")
+
+        def write_string():
+            with open(path, "w") as fp:
+                fp.write(recursive_to_html(root))
+
+        def write_stream():
+            with open(path, "w") as fp:
+                root.write_html(fp)
+
+        measure("recursive to_html + write", write_string)
+        measure("to_html (iter_html join)", root.to_html)
+        measure("write_html (streaming)", write_stream)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from inline import split_nodes_delimiter, split_nodes_images, split_nodes_links, text_to_textnodes
+from textnode import TextNode, TextType
+
+SENTENCE = (
+    "This is **bold** and _italic_ text with a [link](https://www.boot.dev) "
+    "and an ![image](https://i.imgur.com/zjjcJKZ.png) plus some `code` and *more*. "
+)
+SIZES = [("10 KB", 10_000), ("100 KB", 100_000), ("1 MB", 1_000_000)]
+
+
+def six_pass_text_to_textnodes(text):
+    # The chained passes text_to_textnodes used before the single-pass tokenizer.
+    nodes = split_nodes_delimiter([TextNode(text, TextType.TEXT)], "`", TextType.CODE)
+    nodes = split_nodes_images(nodes)
+    nodes = split_nodes_links(nodes)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    return split_nodes_delimiter(nodes, "*", TextType.ITALIC)
+
+
+def paragraph(size):
+    return (SENTENCE * (size // len(SENTENCE) + 1))[:size].rsplit(". ", 1)[0] + "."
+
+
+def best_of(func, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'size':>8} {'six-pass':>12} {'single-pass':>12} {'speedup':>8}")
+    for label, size in SIZES:
+        text = paragraph(size)
+        if six_pass_text_to_textnodes(text) != text_to_textnodes(text):
+            raise SystemExit(f"output mismatch at {label}")
+        repeat = 5 if size < 1_000_000 else 2
+        old = best_of(six_pass_text_to_textnodes, text, repeat)
+        new = best_of(text_to_textnodes, text, repeat)
+        print(f"{label:>8} {old * 1000:>10.1f}ms {new * 1000:>10.1f}ms {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from corpus import inline_block
+from htmlnode import ParentNode, text_node_to_html_node, text_nodes_to_children
+from inline import text_to_textnodes
+
+
+def node_per_text_node(text_nodes):
+    # The previous text_to_children: a LeafNode or ParentNode for every inline node.
+    return [text_node_to_html_node(tn) for tn in text_nodes]
+
+
+def render(convert, paragraphs):
+    return "".join(ParentNode("p", convert(text_nodes)).to_html() for text_nodes in paragraphs)
+
+
+def measure(label, convert, paragraphs, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        html = render(convert, paragraphs)
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<26} {best:>8.3f}s")
+    return best, html
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert and serialize parsed inline nodes, with and without emitted fragments.")
+    parser.add_argument("--paragraphs", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Parsed up front: this measures the stage after text_to_textnodes.
+    rng = random.Random(23)
+    paragraphs = [text_to_textnodes(inline_block(rng)) for _ in range(args.paragraphs)]
+    print(f"{sum(map(len, paragraphs)):,} inline nodes in {args.paragraphs:,} paragraphs")
+    current, html = measure("emitted fragments", text_nodes_to_children, paragraphs, args.repeat)
+    previous, previous_html = measure("node per text node", node_per_text_node, paragraphs, args.repeat)
+    if html != previous_html:
+        raise SystemExit("output mismatch")
+    print(f"speedup: {previous / current:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
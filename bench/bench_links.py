@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from inline import extract_markdown_links, split_nodes_links
+from textnode import TextNode, TextType
+
+
+def str_split_nodes_links(old_nodes):
+    # The previous implementation: rebuild each link and split the remaining tail.
+    new_nodes = []
+    for nodes in old_nodes:
+        if nodes.text_type != TextType.TEXT:
+            new_nodes.append(nodes)
+            continue
+        splits = extract_markdown_links(nodes.text)
+        if len(splits) == 0:
+            new_nodes.append(nodes)
+            continue
+        current_text = nodes.text
+        for link_text, url in splits:
+            current_text = current_text.split(f"[{link_text}]({url})", 1)
+            if current_text[0] != "":
+                new_nodes.append(TextNode(current_text[0], TextType.TEXT))
+            new_nodes.append(TextNode(link_text, TextType.LINK, url))
+            current_text = current_text[1]
+        if current_text != "":
+            new_nodes.append(TextNode(current_text, TextType.TEXT))
+    return new_nodes
+
+
+def index_page(links):
+    return " | ".join(f"[Page {i}](/reference/page-{i}.html)" for i in range(links))
+
+
+def best_of(func, nodes, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(nodes)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'links':>8} {'str.split':>12} {'finditer':>12} {'speedup':>8}")
+    for links in (500, 5_000, 20_000):
+        nodes = [TextNode(index_page(links), TextType.TEXT)]
+        if str_split_nodes_links(nodes) != split_nodes_links(nodes):
+            raise SystemExit(f"output mismatch at {links} links")
+        old = best_of(str_split_nodes_links, nodes)
+        new = best_of(split_nodes_links, nodes)
+        print(f"{links:>8} {old * 1000:>10.1f}ms {new * 1000:>10.1f}ms {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blocks import iter_html_nodes, map_markdown
+from corpus import generate
+
+
+def render(path, mode):
+    # Renders block by block and discards the HTML, so peak RSS reflects the input path.
+    start = time.perf_counter()
+    emitted = 0
+    if mode == "str":
+        with open(path, encoding="utf-8") as fp:
+            markdown = fp.read()
+        for node in iter_html_nodes(markdown):
+            emitted += len(node.to_html())
+    else:
+        with map_markdown(path) as buffer:
+            for node in iter_html_nodes(buffer):
+                emitted += len(node.to_html())
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:>6} {elapsed:>9.2f} {peak:>12.1f} {emitted:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak RSS of str input vs memory-mapped input.")
+    parser.add_argument("--mb", type=int, default=200, help="size of the generated markdown file")
+    parser.add_argument("--corpus", default="mixed")
+    parser.add_argument("--mode", choices=["str", "mmap"], help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        render(args.path, args.mode)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "large.md")
+        with open(path, "w", encoding="utf-8") as fp:
+            # Written in slices so the generator's own string is not the whole file.
+            for _ in range(args.mb):
+                fp.write(generate(args.corpus, 1_000_000))
+                fp.write("\n\n")
+        print(f"{'input':>6} {'seconds':>9} {'peak RSS MB':>12} {'html chars':>12}")
+        # Each mode runs in a fresh process so ru_maxrss is not shared between them.
+        for mode in ("str", "mmap"):
+            subprocess.run([sys.executable, __file__, "--mode", mode, "--path", path], check=True)
+
+
+if __name__ == "__main__":
+    main()
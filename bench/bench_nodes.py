@@ -0,0 +1,101 @@
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blocks import markdown_to_html_node
+from htmlnode import LeafNode, ParentNode
+from inline import text_to_textnodes
+from textnode import TextNode
+
+
+class DictTextNode:
+    # TextNode as it was before __slots__.
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+
+class DictHTMLNode:
+    # HTMLNode as it was before __slots__, including the value/children aliasing.
+    def __init__(self, tag=None, value=None, children=None, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = children
+        self.props = props
+        if self.value == None:
+            self.value = children
+        if self.children == None:
+            self.children = value
+
+
+class DictLeafNode(DictHTMLNode):
+    def __init__(self, tag, value, props=None):
+        super().__init__(tag, value, None, props)
+
+
+class DictParentNode(DictHTMLNode):
+    def __init__(self, tag, children, props=None):
+        super().__init__(tag, None, children, props)
+
+
+BLOCK = """## Section {n}
+
+Some prose with **bold**, _italic_, `code` and a [link](https://www.boot.dev/{n}).
+
+- item with ![icon](/img/{n}.png)
+- another item
+
+> quoted text"""
+
+
+def clone_html(node, leaf_cls, parent_cls):
+    # Rebuilds the tree with the given classes, reusing the same strings.
+    if isinstance(node, ParentNode):
+        children = [clone_html(child, leaf_cls, parent_cls) for child in node.children]
+        return parent_cls(node.tag, children, dict(node.props) if node.props else None)
+    return leaf_cls(node.tag, node.value, dict(node.props) if node.props else None)
+
+
+def count_nodes(node):
+    if isinstance(node, ParentNode):
+        return 1 + sum(count_nodes(child) for child in node.children)
+    return 1
+
+
+def traced(func):
+    tracemalloc.start()
+    result = func()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes per node with and without __slots__.")
+    parser.add_argument("--blocks", type=int, default=20_000)
+    args = parser.parse_args()
+
+    markdown = "\n\n".join(BLOCK.format(n=n) for n in range(args.blocks))
+    root = markdown_to_html_node(markdown)
+    nodes = count_nodes(root)
+    text_nodes = [node for n in range(args.blocks) for node in text_to_textnodes(
+        f"Some prose with **bold**, _italic_, `code` and a [link](https://www.boot.dev/{n}).")]
+
+    _, dict_html = traced(lambda: clone_html(root, DictLeafNode, DictParentNode))
+    _, slot_html = traced(lambda: clone_html(root, LeafNode, ParentNode))
+    _, dict_text = traced(lambda: [DictTextNode(t.text, t.text_type, t.url) for t in text_nodes])
+    _, slot_text = traced(lambda: [TextNode(t.text, t.text_type, t.url) for t in text_nodes])
+
+    print(f"{'':<12} {'nodes':>9} {'__dict__':>12} {'__slots__':>12} {'saved':>7}")
+    print(f"{'HTMLNode':<12} {nodes:>9} {dict_html / nodes:>10.1f} B {slot_html / nodes:>10.1f} B "
+          f"{1 - slot_html / dict_html:>6.0%}")
+    print(f"{'TextNode':<12} {len(text_nodes):>9} {dict_text / len(text_nodes):>10.1f} B "
+          f"{slot_text / len(text_nodes):>10.1f} B {1 - slot_text / dict_text:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
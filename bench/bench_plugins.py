@@ -0,0 +1,75 @@
+import argparse
+import enum
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import blocks
+from blocks import BlockType, block_to_block_type, iter_blocks, register_block_type, unregister_block_type
+from corpus import generate
+
+# The previous classifier: one fixed (check, block type) per first character.
+FIXED_DISPATCH = {
+    "#": (blocks._is_heading, BlockType.HEADING),
+    "`": (blocks._is_code, BlockType.CODE),
+    ">": (blocks._is_quote, BlockType.QUOTE),
+    "-": (blocks._is_unordered_list, BlockType.UNORDERED_LIST),
+    "1": (blocks._is_ordered_list, BlockType.ORDERED_LIST),
+}
+
+
+def fixed_block_to_block_type(block):
+    candidate = FIXED_DISPATCH.get(block[:1])
+    if candidate is not None and candidate[0](block):
+        return candidate[1]
+    return BlockType.PARAGRAPH
+
+
+# Stand-ins for table, admonition, footnote and similar plugins, each on its own first character.
+Extra = enum.Enum("Extra", [f"PLUGIN_{i}" for i in range(20)])
+EXTRA_CHARS = "|!:[=+*~^%@$&;,<?.0_\\"
+
+
+def classify_all(classify, corpus):
+    for block in corpus:
+        classify(block)
+
+
+def measure(label, classify, corpus, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        classify_all(classify, corpus)
+        best = min(best, time.perf_counter() - start)
+    per_block = best / len(corpus) * 1e9
+    print(f"{label:<34} {best * 1000:>9.1f}ms {per_block:>8.0f}ns/block")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify blocks with the plugin registry vs the fixed table.")
+    parser.add_argument("--chars", type=int, default=5_000_000)
+    parser.add_argument("--corpus", default="mixed")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = list(iter_blocks(generate(args.corpus, args.chars)))
+    if [fixed_block_to_block_type(b) for b in corpus] != [block_to_block_type(b) for b in corpus]:
+        raise SystemExit("classification mismatch")
+    print(f"{len(corpus):,} blocks")
+    fixed = measure("fixed table (previous)", fixed_block_to_block_type, corpus, args.repeat)
+    registry = measure("registry, built-in types", block_to_block_type, corpus, args.repeat)
+    for member, char in zip(Extra, EXTRA_CHARS):
+        register_block_type(member, char, lambda block: False, None)
+    try:
+        plugins = measure(f"registry, {len(Extra)} more plugins", block_to_block_type, corpus, args.repeat)
+    finally:
+        for member in Extra:
+            unregister_block_type(member)
+    print(f"registry vs fixed: {fixed / registry:.2f}x, with plugins: {fixed / plugins:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
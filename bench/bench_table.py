@@ -0,0 +1,63 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blocks import markdown_to_html_node
+
+
+def api_table(rows):
+    lines = ["| Name | Type | Default | Description |", "|:-----|:----:|--------:|-------------|"]
+    for i in range(rows):
+        lines.append(f"| `option_{i}` | **int** | {i} | Sets [option {i}](/options#{i}) \\| see notes |")
+    return "\n".join(lines)
+
+
+class NullWriter:
+    def __init__(self):
+        self.size = 0
+
+    def write(self, text):
+        self.size += len(text)
+
+
+def write(markdown, materialize):
+    node = markdown_to_html_node(markdown)
+    if materialize:
+        # The row list a non-streaming parser would build before emitting anything.
+        body = node.children[0].children[1]
+        body.children = list(body.children)
+    sink = NullWriter()
+    node.write_html(sink)
+    return sink.size
+
+
+def measure(label, markdown, materialize):
+    start = time.perf_counter()
+    write(markdown, materialize)
+    elapsed = time.perf_counter() - start
+    # Traced separately: tracemalloc slows allocation down several times.
+    tracemalloc.start()
+    write(markdown, materialize)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<18} {elapsed:>8.2f}s {peak / 1e6:>10.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a large pipe table with streamed vs materialized rows.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    markdown = api_table(args.rows)
+    print(f"{args.rows:,} rows, {len(markdown) / 1e6:.1f} MB of markdown")
+    print(f"{'rows':<18} {'seconds':>9} {'peak MB':>13}")
+    measure("streamed", markdown, False)
+    measure("materialized", markdown, True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blocks import markdown_to_html_node
+from corpus import generate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling of markdown_to_html_node(workers=N) on one document.")
+    parser.add_argument("--size", type=int, default=5_000_000, help="approximate characters in the document")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--corpus", default="mixed")
+    args = parser.parse_args()
+
+    markdown = generate(args.corpus, args.size)
+    expected = None
+    baseline = None
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8}")
+    for workers in range(1, args.max_workers + 1):
+        start = time.perf_counter()
+        html = markdown_to_html_node(markdown, workers=workers).to_html()
+        elapsed = time.perf_counter() - start
+        if expected is None:
+            expected, baseline = html, elapsed
+        elif html != expected:
+            raise SystemExit(f"output differs with {workers} workers")
+        print(f"{workers:>8} {elapsed:>9.2f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import random
+
+WORDS = (
+    "the static site generator renders markdown into html pages quickly and keeps "
+    "every block small enough to stream through the parser without copying data"
+).split()
+
+
+def _sentence(rng, words=12):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _inline(rng):
+    # A sentence with balanced inline markup, safe for text_to_textnodes.
+    word = rng.choice(WORDS)
+    return rng.choice([
+        f"Some **{word}** text.",
+        f"An _{word}_ word.",
+        f"A `{word}()` call.",
+        f"See [{word}](https://example.com/{word}).",
+        f"Look ![{word}](/img/{word}.png) here.",
+        _sentence(rng, 8),
+    ])
+
+
+def prose_block(rng):
+    return "\n".join(" ".join(_sentence(rng) for _ in range(3)) for _ in range(rng.randint(2, 5)))
+
+
+def link_block(rng):
+    return " | ".join(f"[{rng.choice(WORDS)} {i}](/reference/{rng.choice(WORDS)}-{i}.html)"
+                      for i in range(rng.randint(20, 60)))
+
+
+def list_block(rng):
+    if rng.random() < 0.5:
+        return "\n".join(f"- {_inline(rng)}" for _ in range(rng.randint(5, 40)))
+    return "\n".join(f"{i}. {_inline(rng)}" for i in range(1, rng.randint(5, 40)))
+
+
+def code_block(rng):
+    lines = [f"    {rng.choice(WORDS)}_{i} = compute({rng.randint(0, 999)}) * 2" for i in range(rng.randint(5, 30))]
+    return "```\ndef example():\n" + "\n".join(lines) + "\n```"
+
+
+def quote_block(rng):
+    # A reply thread: the quote depth drifts between 1 and 8 levels from line to line.
+    # Blocks only parse one level of quoting, so the inner "> " markers render as text,
+    # but every line still goes through the quote path.
+    lines = []
+    depth = 1
+    for _ in range(rng.randint(10, 60)):
+        depth = min(8, max(1, depth + rng.choice((-1, 0, 1))))
+        lines.append("> " * depth + f"{_inline(rng)} {_sentence(rng, 6)}")
+    return "\n".join(lines)
+
+
+def mixed_block(rng):
+    if rng.random() < 0.15:
+        return "#" * rng.randint(1, 6) + " " + _sentence(rng, 5)
+    return rng.choice(GENERATORS[:5])(rng)
+
+
+def inline_block(rng):
+    return " ".join(_inline(rng) for _ in range(rng.randint(5, 15)))
+
+
+GENERATORS = [prose_block, link_block, list_block, code_block, quote_block]
+
+CORPORA = {
+    "prose": lambda rng: prose_block(rng) if rng.random() < 0.6 else inline_block(rng),
+    "links": link_block,
+    "lists": list_block,
+    "code": code_block,
+    "quotes": quote_block,
+    "mixed": mixed_block,
+}
+
+
+def generate(name, size, seed=0):
+    # Returns a reproducible markdown document of about size characters.
+    rng = random.Random(f"{name}:{seed}")
+    block = CORPORA[name]
+    blocks = []
+    total = 0
+    while total < size:
+        text = block(rng)
+        blocks.append(text)
+        total += len(text) + 2
+    return "\n\n".join(blocks)
@@ -0,0 +1,124 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blocks import markdown_to_blocks, markdown_to_html_node
+from corpus import CORPORA, generate
+from inline import text_to_textnodes
+
+
+def _size(text):
+    return len(text.encode("utf-8"))
+
+
+def _inline_inputs(markdown):
+    blocks = [block for block in markdown_to_blocks(markdown) if not block.startswith("```")]
+    return blocks, sum(_size(block) for block in blocks)
+
+
+STAGES = {
+    # name: (setup(markdown) -> (argument, input bytes), stage(argument))
+    "text_to_textnodes": (_inline_inputs, lambda blocks: [text_to_textnodes(b) for b in blocks]),
+    "markdown_to_blocks": (lambda md: (md, _size(md)), markdown_to_blocks),
+    "markdown_to_html_node": (lambda md: (md, _size(md)), markdown_to_html_node),
+    "to_html": (lambda md: (markdown_to_html_node(md), _size(md)), lambda node: node.to_html()),
+}
+
+
+def run_stage(stage, argument, size, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stage(argument)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    stage(argument)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "seconds": best,
+        "ops_per_sec": 1 / best,
+        "mb_per_sec": size / best / 1_000_000,
+        "peak_mb": peak / 1_000_000,
+    }
+
+
+def run(corpora, stages, size, repeat, seed):
+    results = {}
+    for name in corpora:
+        markdown = generate(name, size, seed)
+        results[name] = {}
+        for stage_name in stages:
+            setup, stage = STAGES[stage_name]
+            argument, nbytes = setup(markdown)
+            if not nbytes:
+                continue
+            results[name][stage_name] = run_stage(stage, argument, nbytes, repeat)
+            row = results[name][stage_name]
+            print(f"{name:<8} {stage_name:<22} {row['mb_per_sec']:>8.2f} MB/s {row['ops_per_sec']:>9.2f} ops/s "
+                  f"{row['peak_mb']:>8.1f} MB peak", file=sys.stderr)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "size": size,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold):
+    # Returns the (corpus, stage, metric, old, new) rows that regressed past threshold.
+    regressions = []
+    for name, stages in report["results"].items():
+        for stage_name, row in stages.items():
+            old = baseline["results"].get(name, {}).get(stage_name)
+            if old is None:
+                continue
+            if row["mb_per_sec"] < old["mb_per_sec"] * (1 - threshold):
+                regressions.append((name, stage_name, "mb_per_sec", old["mb_per_sec"], row["mb_per_sec"]))
+            if row["peak_mb"] > old["peak_mb"] * (1 + threshold):
+                regressions.append((name, stage_name, "peak_mb", old["peak_mb"], row["peak_mb"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the render pipeline on synthetic corpora.")
+    parser.add_argument("--size", type=int, default=1_000_000, help="approximate characters per corpus")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage; the best is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus", action="append", choices=sorted(CORPORA), help="corpora to run (default: all)")
+    parser.add_argument("--stage", action="append", choices=list(STAGES), help="stages to run (default: all)")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against a saved results file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative slowdown or growth")
+    args = parser.parse_args()
+
+    report = run(args.corpus or list(CORPORA), args.stage or list(STAGES), args.size, args.repeat, args.seed)
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(report, fp, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare) as fp:
+            baseline = json.load(fp)
+        regressions = compare(report, baseline, args.threshold)
+        for name, stage_name, metric, old, new in regressions:
+            print(f"REGRESSION {name}/{stage_name} {metric}: {old:.2f} -> {new:.2f}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions beyond {args.threshold:.0%}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import hashlib
+import os
+import pickle
+import sys
+from collections import OrderedDict
+
+from htmlnode import ParentNode
+
+CACHE_VERSION = 2
+
+
+def _node_size(node):
+    # Rough bytes held by a rendered node tree: object headers plus string payloads.
+    # Returns None for a tree with lazily parsed children, such as table rows.
+    size = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        size += 200
+        if isinstance(node, ParentNode):
+            if type(node.children) is not list:
+                return None
+            stack.extend(node.children)
+        elif isinstance(node.value, str):
+            size += sys.getsizeof(node.value)
+        if node.props:
+            size += sum(sys.getsizeof(v) for v in node.props.values())
+    return size
+
+
+class BlockCache:
+    # LRU cache of rendered block nodes keyed by block text and block type.
+    # Cached nodes are shared between documents and must be treated as read-only.
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, path=None):
+        self.max_bytes = max_bytes
+        self.path = path
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(block, block_type):
+        digest = hashlib.blake2b(block.encode("utf-8"), digest_size=16).digest()
+        return (block_type.value, digest)
+
+    def get(self, block, block_type):
+        key = self.key(block, block_type)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, block, block_type, node):
+        # Lazily parsed nodes are parsed again whenever they are written, so caching them
+        # would save nothing, and sizing them would parse them once more.
+        size = _node_size(node)
+        if size is not None:
+            self._store(self.key(block, block_type), node, size + len(block))
+
+    def _store(self, key, node, size):
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+        self._entries[key] = (node, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.size -= evicted
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def load(self, path=None):
+        # Loads entries saved by save(); a missing, corrupt or outdated file leaves the cache empty.
+        # The version is a pickle of its own, so an outdated file is rejected before any of its
+        # nodes are unpickled. Unpickling can fail in many ways (AttributeError for a changed
+        # class layout, ImportError for a moved module, ...), and every failure means the same.
+        path = path or self.path
+        try:
+            with open(path, "rb") as fp:
+                if pickle.load(fp) != CACHE_VERSION:
+                    return
+                entries = pickle.load(fp)
+        except Exception:
+            return
+        for key, node, size in entries:
+            self._store(key, node, size)
+
+    def save(self, path=None):
+        path = path or self.path
+        entries = [(key, node, size) for key, (node, size) in self._entries.items()]
+        with open(path + ".tmp", "wb") as fp:
+            pickle.dump(CACHE_VERSION, fp, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(entries, fp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
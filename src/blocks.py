@@ -1,9 +1,22 @@
-from htmlnode import LeafNode, ParentNode, text_node_to_html_node
+from htmlnode import LeafNode, ParentNode, RawNode, escape_text, text_nodes_to_children
+from compact import CompactDocument
 from textnode import TextNode, TextType
+import contextlib
+import functools
+import io
+import mmap
+import os
 import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
 from inline import text_to_textnodes
 
+class RenderLimitError(ValueError):
+    # Raised when a document is larger or slower to render than the caller allowed.
+    pass
+
 class BlockType(Enum):
     PARAGRAPH = "paragraph"
     HEADING = "heading"
@@ -11,56 +24,337 @@ class BlockType(Enum):
     QUOTE = "quote"
     UNORDERED_LIST = "unordered list"
     ORDERED_LIST = "ordered list"
+    TABLE = "table"
+
+_ORDERED_ITEM_PATTERN = re.compile(r"\n([1-9][0-9]*)\. ")
+
+@functools.lru_cache(maxsize=256)
+def _numbering(count):
+    # "1\n2\n...\ncount", built once per list length instead of once per line.
+    return "\n".join(map(str, range(1, count + 1)))
+
+def _is_heading(block):
+    return True
+
+def _is_code(block):
+    return block.startswith("```\n") and block.endswith("```")
+
+def _is_quote(block):
+    # Every line starts with ">": each newline must be followed by one.
+    return block.count("\n") == block.count("\n>")
+
+def _is_unordered_list(block):
+    return block.startswith("- ") and block.count("\n") == block.count("\n- ")
+
+def _is_ordered_list(block):
+    # One match per line, numbered 1, 2, 3, ... in order.
+    numbers = _ORDERED_ITEM_PATTERN.findall("\n" + block)
+    if len(numbers) != block.count("\n") + 1:
+        return False
+    return "\n".join(numbers) == _numbering(len(numbers))
+
+_TABLE_PIPE = re.compile(r"(?<!\\)\|")
+_TABLE_DELIMITER_CELL = re.compile(r":?-+:?")
+
+def _table_cells(line, columns=None):
+    # The cells of one table row; "\|" is a literal pipe. With columns, missing cells
+    # are added empty and extra cells dropped, as GFM does.
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|") and not line.endswith("\\|"):
+        line = line[:-1]
+    cells = [cell.strip().replace("\\|", "|") for cell in _TABLE_PIPE.split(line)]
+    if columns is not None and len(cells) != columns:
+        cells = cells[:columns] + [""] * (columns - len(cells))
+    return cells
+
+def _is_table(block):
+    # A header row, then a delimiter row such as |:--|--:| with as many cells.
+    # Only the first two lines are read, however long the table is.
+    first = block.find("\n")
+    if first < 0:
+        return False
+    second = block.find("\n", first + 1)
+    cells = _table_cells(block[first + 1:] if second < 0 else block[first + 1:second])
+    if not all(_TABLE_DELIMITER_CELL.fullmatch(cell) for cell in cells):
+        return False
+    return len(cells) == len(_table_cells(block[:first]))
+
+# First character of a block -> [(matches, block type), ...], tried in registration order;
+# a block no plugin claims is a paragraph. Filled by register_block_type.
+_BLOCK_TYPE_DISPATCH = {}
+_BLOCK_RENDERERS = {}
+
+def register_block_type(block_type, first_chars, matches, to_html_node):
+    # Registers a block plugin, replacing any earlier registration of block_type.
+    # block_type is an Enum member, as its name and value key the instrument counters and
+    # the block cache. matches(block) is only called for blocks that start with one of
+    # first_chars, so classifying any other block never pays for the plugin.
+    # to_html_node(block) returns the block's HTMLNode. Worker processes inherit the
+    # plugins registered before the pool forks.
+    unregister_block_type(block_type)
+    for char in first_chars:
+        _BLOCK_TYPE_DISPATCH.setdefault(char, []).append((matches, block_type))
+    _BLOCK_RENDERERS[block_type] = to_html_node
+
+def unregister_block_type(block_type):
+    for char, candidates in list(_BLOCK_TYPE_DISPATCH.items()):
+        candidates[:] = [candidate for candidate in candidates if candidate[1] is not block_type]
+        if not candidates:
+            del _BLOCK_TYPE_DISPATCH[char]
+    _BLOCK_RENDERERS.pop(block_type, None)
 
 def block_to_block_type(block):
-    if block.startswith("#"):
-        return BlockType.HEADING
-    elif block.startswith("```\n") and block.endswith("```"):
-        return BlockType.CODE
-    elif block.startswith(">"):
-        return BlockType.QUOTE
-    elif block.startswith("- "):
-        return BlockType.UNORDERED_LIST
-    elif block[0].isdigit() and block.startswith(". ", 1): # Check for "1. ", "2. ", etc.
-        if len(block.split("\n")) > 1: 
-            lines = block.split("\n") 
-            for i, line in enumerate(lines):
-                expected_number = i + 1 
-                if not line.startswith(f"{expected_number}. "): 
-                    return BlockType.PARAGRAPH
-        return BlockType.ORDERED_LIST
-    else:
-        return BlockType.PARAGRAPH
+    for matches, block_type in _BLOCK_TYPE_DISPATCH.get(block[:1], ()):
+        if matches(block):
+            return block_type
+    return BlockType.PARAGRAPH
+
+def _is_fence(line):
+    return line.lstrip().startswith("```")
 
+def _decode(buffer, start, end):
+    with memoryview(buffer) as view, view[start:end] as chunk:
+        return str(chunk, "utf-8")
+
+def _iter_buffer_blocks(buffer):
+    # Same rules as iter_blocks, but scans UTF-8 bytes in place and only decodes each
+    # block once its boundaries are known. Lines must end in "\n", as in a str input.
+    size = len(buffer)
+    pos = 0
+    while pos < size:
+        start = pos
+        started = False
+        in_fence = False
+        # Until the first non-blank line, each line decides whether a fence opens.
+        while pos < size:
+            end = buffer.find(b"\n", pos)
+            if end == -1:
+                end = size
+            line = _decode(buffer, pos, end)
+            pos = end + 1
+            if line == "":
+                break
+            if _is_fence(line):
+                stripped = line.strip()
+                in_fence = len(stripped) < 6 or not stripped.endswith("```")
+            if not line.isspace():
+                started = True
+                break
+        if not started:
+            continue
+        # Inside a fence, only lines ending in ``` matter.
+        while in_fence and pos < size:
+            end = buffer.find(b"\n", pos)
+            if end == -1:
+                end = size
+            ticks = buffer.find(b"```", pos, end)
+            if ticks != -1 and _decode(buffer, ticks, end).rstrip().endswith("```"):
+                in_fence = False
+            pos = end + 1
+        if in_fence or pos >= size:
+            yield _decode(buffer, start, size).strip()
+            return
+        # Otherwise the block runs to the next empty line.
+        blank = buffer.find(b"\n\n", pos - 1)
+        if blank == -1:
+            yield _decode(buffer, start, size).strip()
+            return
+        yield _decode(buffer, start, blank).strip()
+        pos = blank + 2
+
+@contextlib.contextmanager
+def map_markdown(path):
+    # Memory-maps a markdown file for iter_blocks / markdown_to_html_node, so large
+    # inputs are never read or decoded as a whole.
+    with open(path, "rb") as fp:
+        if os.fstat(fp.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+def iter_blocks(markdown):
+    # Yields stripped blocks from a string, a file object or any iterable of lines.
+    # Blank lines end a block, except inside a fenced code block.
+    # UTF-8 bytes, bytearrays and mmaps are scanned without decoding them whole.
+    if isinstance(markdown, (bytes, bytearray, mmap.mmap)):
+        yield from _iter_buffer_blocks(markdown)
+        return
+    if isinstance(markdown, str):
+        markdown = io.StringIO(markdown)
+    lines = []
+    started = False
+    in_fence = False
+    for line in markdown:
+        line = line.rstrip("\n")
+        if in_fence:
+            lines.append(line)
+            if line.rstrip().endswith("```"):
+                in_fence = False
+            continue
+        if line == "":
+            if started:
+                yield "\n".join(lines).strip()
+            lines = []
+            started = False
+            continue
+        if not started and _is_fence(line):
+            stripped = line.strip()
+            in_fence = len(stripped) < 6 or not stripped.endswith("```")
+        lines.append(line)
+        started = started or not line.isspace()
+    if started:
+        yield "\n".join(lines).strip()
 
 def markdown_to_blocks(markdown):
-    splitblocks = markdown.split("\n\n")
-    blocks = []
-    for block in splitblocks:
-        if block.strip() != "":
-            blocks.append(block.strip())
-    return blocks
-
-def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
-    htmlnodes = []
+    return list(iter_blocks(markdown))
+
+def block_to_html_node(block, block_type):
+    to_html_node = _BLOCK_RENDERERS.get(block_type)
+    if to_html_node is None:
+        raise ValueError(f"unknown block type: {block_type}")
+    return to_html_node(block)
+
+PARALLEL_CHUNK_CHARS = 64 * 1024
+
+def _iter_block_chunks(blocks, chunk_chars):
+    chunk = []
+    size = 0
+    for block in blocks:
+        chunk.append(block)
+        size += len(block)
+        if size >= chunk_chars:
+            yield chunk
+            chunk = []
+            size = 0
+    if chunk:
+        yield chunk
+
+def _node_to_tuple(node):
+    # Plain tuples pickle several times faster than node objects.
+    if isinstance(node, ParentNode):
+        return (node.tag, node.props, [_node_to_tuple(child) for child in node.children])
+    return (node.tag, node.props, node.value, isinstance(node, RawNode))
+
+def _tuple_to_node(data):
+    if len(data) == 3:
+        tag, props, children = data
+        return ParentNode(tag, [_tuple_to_node(child) for child in children], props)
+    tag, props, value, raw = data
+    return (RawNode if raw else LeafNode)(tag, value, props)
+
+def _render_block_chunk(blocks):
+    return [_node_to_tuple(block_to_html_node(block, block_to_block_type(block))) for block in blocks]
+
+def _iter_html_nodes_parallel(blocks, workers):
+    # Blocks are sent to the pool in chunks of about PARALLEL_CHUNK_CHARS; at most two
+    # chunks per worker are in flight, and results are yielded in document order.
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _iter_block_chunks(blocks, PARALLEL_CHUNK_CHARS):
+            pending.append(executor.submit(_render_block_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from map(_tuple_to_node, pending.popleft().result())
+        while pending:
+            yield from map(_tuple_to_node, pending.popleft().result())
+
+def _limited_blocks(blocks, max_chars, time_budget):
+    # Checked between blocks: parsing is linear, so a block cannot overrun either limit by
+    # more than the time it takes to render that one block.
+    total = 0
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    for block in blocks:
+        total += len(block)
+        if max_chars is not None and total > max_chars:
+            raise RenderLimitError(f"document is longer than {max_chars} characters")
+        if deadline is not None and time.monotonic() > deadline:
+            raise RenderLimitError(f"document took longer than {time_budget}s to render")
+        yield block
+
+def iter_html_nodes(markdown, cache=None, workers=1, max_chars=None, time_budget=None):
+    # With a BlockCache, repeated blocks reuse the node rendered the first time.
+    # With workers > 1, classification and inline parsing run in a process pool.
+    # For untrusted input, max_chars and time_budget (seconds) raise RenderLimitError
+    # once the document's blocks exceed them.
+    blocks = iter_blocks(markdown)
+    if max_chars is not None or time_budget is not None:
+        blocks = _limited_blocks(blocks, max_chars, time_budget)
+    if workers > 1:
+        if cache is not None:
+            raise ValueError("a block cache cannot be shared with worker processes")
+        yield from _iter_html_nodes_parallel(blocks, workers)
+        return
     for block in blocks:
         block_type = block_to_block_type(block)
-        match block_type:
-            case BlockType.HEADING:
-                htmlnodes.append(heading_to_html_node(block))
-            case BlockType.PARAGRAPH:
-                htmlnodes.append(paragraph_to_html_node(block))
-            case BlockType.ORDERED_LIST:
-                htmlnodes.append(ordered_list_to_html_node(block))
-            case BlockType.UNORDERED_LIST:
-                htmlnodes.append(unordered_list_to_html_node(block))
-            case BlockType.CODE:
-                htmlnodes.append(code_to_html_node(block))
-            case BlockType.QUOTE:
-                htmlnodes.append(quote_to_html_node(block))
-    parent = ParentNode("div", htmlnodes)
+        if cache is None:
+            yield block_to_html_node(block, block_type)
+            continue
+        node = cache.get(block, block_type)
+        if node is None:
+            node = block_to_html_node(block, block_type)
+            cache.put(block, block_type, node)
+        yield node
+
+def markdown_to_html_node(markdown, cache=None, compact=False, workers=1, max_chars=None, time_budget=None):
+    # markdown may be a string or a stream of lines; blocks are parsed one at a time.
+    # With compact=True the result is a CompactDocument: each block is flattened into
+    # its arrays as soon as it is rendered, so no document-wide node graph is kept.
+    nodes = iter_html_nodes(markdown, cache, workers, max_chars, time_budget)
+    if compact:
+        document = CompactDocument()
+        document.open("div")
+        for node in nodes:
+            document.append(node)
+        document.close()
+        return document
+    parent = ParentNode("div", list(nodes))
     return parent
+
+def _iter_snippet_blocks(markdown):
+    # Most snippets are one line, which iter_blocks would return stripped as-is.
+    if "\n" not in markdown:
+        block = markdown.strip()
+        return (block,) if block else ()
+    return iter_blocks(markdown)
+
+def _small_html(node, depth=3):
+    # Block trees are shallow (ul > li > inline leaves), and joining them directly is
+    # cheaper than starting ParentNode.iter_html's generator for every snippet.
+    if type(node) is not ParentNode or depth == 0:
+        return node.to_html()
+    parts = [node.open_tag()]
+    for child in node.children:
+        parts.append(child.to_html() if type(child) is LeafNode else _small_html(child, depth - 1))
+    parts.append(f"</{node.tag}>")
+    return "".join(parts)
+
+def render_many(snippets, dedupe=False, cache=None):
+    # Yields markdown_to_html_node(snippet, cache).to_html() for each snippet string,
+    # without building a wrapper node per snippet. With dedupe=True, repeated snippets
+    # reuse the HTML of their first occurrence, for the lifetime of the generator.
+    seen = {} if dedupe else None
+    for markdown in snippets:
+        if seen is not None:
+            html = seen.get(markdown)
+            if html is not None:
+                yield html
+                continue
+        parts = ["<div>"]
+        for block in _iter_snippet_blocks(markdown):
+            block_type = block_to_block_type(block)
+            node = cache.get(block, block_type) if cache is not None else None
+            if node is None:
+                node = block_to_html_node(block, block_type)
+                if cache is not None:
+                    cache.put(block, block_type, node)
+            parts.append(_small_html(node))
+        parts.append("</div>")
+        html = "".join(parts)
+        if seen is not None:
+            seen[markdown] = html
+        yield html
         
 def heading_to_html_node(block):
     children = text_to_children(block.lstrip("#").strip()) # Remove leading # and spaces
@@ -90,20 +384,70 @@ def unordered_list_to_html_node(block):
     return ParentNode("ul", li_nodes)
 
 def code_to_html_node(block):
-    content = block[4:-3] # Remove ``` and newlines
-    return ParentNode("pre", [ParentNode("code", [LeafNode(None, content)])])
+    content = escape_text(block[4:-3]) # Remove ``` and newlines, escaped once here
+    return ParentNode("pre", [ParentNode("code", [RawNode(None, content)])])
 
 def quote_to_html_node(block):
-    children = []
-    recombined = ""
-    for line in block.split("\n"):
-        if line.startswith(">"):
-            content = line[1:].strip() # Remove > and leading spaces
-            recombined += content + " " # Recombine lines with space
-    children = text_to_children(recombined.strip())     
+    # Remove > and leading spaces, then recombine lines with a space
+    lines = [line[1:].strip() for line in block.split("\n") if line.startswith(">")]
+    children = text_to_children(" ".join(lines).strip())
     return ParentNode("blockquote", children)
 
+# (starts with ":", ends with ":") of a delimiter cell -> cell props.
+_TABLE_ALIGN = {
+    (False, False): None,
+    (True, False): {"align": "left"},
+    (False, True): {"align": "right"},
+    (True, True): {"align": "center"},
+}
+
+class _TableRows:
+    # The body rows of a table, parsed from the block text each time they are iterated,
+    # so writing a 100k-row table never holds more than one row's nodes at a time.
+    __slots__ = ("block", "start", "aligns")
+
+    def __init__(self, block, start, aligns):
+        self.block = block
+        self.start = start
+        self.aligns = aligns
+
+    def _row(self, line):
+        cells = _table_cells(line, len(self.aligns))
+        return ParentNode("tr", [
+            ParentNode("td", text_to_children(cell), align) for cell, align in zip(cells, self.aligns)
+        ])
+
+    def __iter__(self):
+        block = self.block
+        start = self.start
+        while start < len(block):
+            end = block.find("\n", start)
+            if end < 0:
+                end = len(block)
+            yield self._row(block[start:end])
+            start = end + 1
+
+def table_to_html_node(block):
+    first = block.index("\n")
+    second = block.find("\n", first + 1)
+    delimiter = block[first + 1:] if second < 0 else block[first + 1:second]
+    aligns = [_TABLE_ALIGN[(cell.startswith(":"), cell.endswith(":"))] for cell in _table_cells(delimiter)]
+    header = _table_cells(block[:first], len(aligns))
+    children = [ParentNode("thead", [ParentNode("tr", [
+        ParentNode("th", text_to_children(cell), align) for cell, align in zip(header, aligns)
+    ])])]
+    if second >= 0:
+        children.append(ParentNode("tbody", _TableRows(block, second + 1, aligns)))
+    return ParentNode("table", children)
+
 def text_to_children(text):
-    text_nodes = text_to_textnodes(text) 
-    html_nodes = [text_node_to_html_node(tn) for tn in text_nodes] 
-    return html_nodes
+    return text_nodes_to_children(text_to_textnodes(text))
+
+# Paragraphs are the fallback, so they need no first characters or predicate.
+register_block_type(BlockType.PARAGRAPH, "", None, paragraph_to_html_node)
+register_block_type(BlockType.HEADING, "#", _is_heading, heading_to_html_node)
+register_block_type(BlockType.CODE, "`", _is_code, code_to_html_node)
+register_block_type(BlockType.QUOTE, ">", _is_quote, quote_to_html_node)
+register_block_type(BlockType.UNORDERED_LIST, "-", _is_unordered_list, unordered_list_to_html_node)
+register_block_type(BlockType.ORDERED_LIST, "1", _is_ordered_list, ordered_list_to_html_node)
+register_block_type(BlockType.TABLE, "|", _is_table, table_to_html_node)
@@ -0,0 +1,328 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import instrument
+from blockcache import BlockCache
+from blocks import iter_html_nodes
+from compress import Compressor, remove_siblings
+from htmlnode import escape_text
+from linkindex import LinkIndex, reference_collector
+from template import compile_template
+
+MARKDOWN_SUFFIX = ".md"
+MANIFEST_NAME = ".manifest.json"
+MANIFEST_VERSION = 1
+
+
+class BuildResult:
+    def __init__(self):
+        self.rendered = []
+        self.skipped = 0
+        self.removed = []
+        self.copied = 0
+        self.elapsed = 0.0
+        self.links = None
+        self.compression = None
+
+    def __repr__(self):
+        return (f"BuildResult(rendered={len(self.rendered)}, skipped={self.skipped}, "
+                f"removed={len(self.removed)}, copied={self.copied}, elapsed={self.elapsed:.3f})")
+
+
+def extract_title(lines):
+    # Returns the text of the first "# " heading, or None if the page has none.
+    for line in lines:
+        if line.startswith("# "):
+            return line[2:].strip()
+    return None
+
+
+def _file_hash(path):
+    with open(path, "rb") as fp:
+        return hashlib.sha256(fp.read()).hexdigest()
+
+
+def _stat_key(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_manifest(dest_dir):
+    # Returns the manifest of the previous build, or an empty one if there is none.
+    empty = {"version": MANIFEST_VERSION, "template": None, "pages": {}, "static": {}}
+    try:
+        with open(os.path.join(dest_dir, MANIFEST_NAME), encoding="utf-8") as fp:
+            manifest = json.load(fp)
+    except (OSError, ValueError):
+        return empty
+    if manifest.get("version") != MANIFEST_VERSION:
+        return empty
+    return manifest
+
+
+def save_manifest(dest_dir, manifest):
+    path = os.path.join(dest_dir, MANIFEST_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as fp:
+        fp.write(json.dumps(manifest, separators=(",", ":")))
+    os.replace(path + ".tmp", path)
+
+
+def _index_path(rel_path):
+    return rel_path.replace(os.sep, "/")
+
+
+def _remove_output(dest_dir, rel_path):
+    path = os.path.join(dest_dir, rel_path)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    remove_siblings(path)
+
+
+def copy_static(src_dir, dest_dir, previous=None, exclude=(), on_copy=None):
+    # Copies the static tree, skipping hidden files such as editor swap files and
+    # any rel_path in exclude (rendered pages win over static files of the same name).
+    # Files whose mtime and size match the previous build's entry are left alone.
+    # on_copy is called with the destination path of every file that is copied.
+    # Returns the number of files copied and the new {rel_path: [mtime_ns, size]} entries.
+    previous = previous or {}
+    entries = {}
+    copied = 0
+    for rel_path in _walk_files(src_dir):
+        if rel_path in exclude:
+            continue
+        src_path = os.path.join(src_dir, rel_path)
+        dest_path = os.path.join(dest_dir, rel_path)
+        key = list(_stat_key(src_path))
+        entries[rel_path] = key
+        if previous.get(rel_path) == key and os.path.exists(dest_path):
+            continue
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        shutil.copy2(src_path, dest_path)
+        if on_copy is not None:
+            on_copy(dest_path)
+        copied += 1
+    return copied, entries
+
+
+def _walk_files(top):
+    # Yields the relative path of every non-hidden file under top, in sorted order.
+    for root, dirs, files in os.walk(top):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        rel_root = os.path.relpath(root, top)
+        prefix = "" if rel_root == "." else rel_root + os.sep
+        for name in sorted(files):
+            if not name.startswith("."):
+                yield prefix + name
+
+
+def find_pages(content_dir):
+    # Maps every markdown file under content_dir to its output path, both relative.
+    return [
+        (rel_path, rel_path[:-len(MARKDOWN_SUFFIX)] + ".html")
+        for rel_path in _walk_files(content_dir)
+        if rel_path.endswith(MARKDOWN_SUFFIX)
+    ]
+
+
+def generate_page(src_path, template, dest_path, cache=None, references=None):
+    # template is a template string or a compiled Template.
+    # When references is a list, the page's ("a", href) and ("img", src) pairs are added to it.
+    with instrument.page(src_path):
+        with open(src_path, encoding="utf-8") as fp:
+            title = extract_title(fp)
+        if title is None:
+            title = os.path.splitext(os.path.basename(src_path))[0]
+        # The body is streamed into the template block by block; neither a full-page
+        # string nor the page's node tree is built. Links and images are collected
+        # during that same pass.
+        visit = reference_collector(references) if references is not None else None
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        with open(src_path, encoding="utf-8") as src, open(dest_path, "w", encoding="utf-8") as fp:
+            content = instrument.stream(_iter_page_html(src, cache, visit))
+            compile_template(template).write(fp, {"Title": escape_text(title), "Content": content})
+    return dest_path
+
+
+def _iter_page_html(markdown, cache, visit):
+    # Same output as markdown_to_html_node(markdown, cache).iter_html(visit), minus
+    # the visit of the wrapping div, holding one block's nodes at a time.
+    yield "<div>"
+    for node in iter_html_nodes(markdown, cache):
+        yield from node.iter_html(visit)
+    yield "</div>"
+
+
+_worker_template = None
+_worker_cache = None
+
+
+def _init_worker(template, cache_bytes, cache_path, profile):
+    # Each worker gets its own block cache, seeded read-only from the persisted file.
+    global _worker_template, _worker_cache
+    _worker_template = template
+    if cache_bytes:
+        _worker_cache = BlockCache(cache_bytes, cache_path)
+    if profile:
+        instrument.enable()
+
+
+def _generate_page_task(paths):
+    # Returns the output path, this page's cache hits and misses, its profile records
+    # and its links and images.
+    cache = _worker_cache
+    hits, misses = (cache.hits, cache.misses) if cache is not None else (0, 0)
+    references = []
+    dest_path = generate_page(paths[0], _worker_template, paths[1], cache, references)
+    if cache is not None:
+        hits, misses = cache.hits - hits, cache.misses - misses
+    records = instrument.pop_pages() if instrument.is_enabled() else []
+    return dest_path, hits, misses, records, references
+
+
+def generate_pages(pages, template, workers=1, cache=None, references=None, on_page=None):
+    # Renders (src_path, dest_path) pairs, in a process pool when workers > 1.
+    # Hits and misses from the workers' caches are added to cache's counters, and
+    # their profile records to this process's instrument stats. If references is a
+    # dict, it maps each dest_path to the page's links and images. on_page is called
+    # with each dest_path as soon as that page has been written.
+    if workers <= 1 or len(pages) <= 1:
+        rendered = []
+        for src_path, dest_path in pages:
+            page_references = [] if references is not None else None
+            rendered.append(generate_page(src_path, template, dest_path, cache, page_references))
+            if references is not None:
+                references[dest_path] = page_references
+            if on_page is not None:
+                on_page(dest_path)
+        return rendered
+    chunksize = max(1, len(pages) // (workers * 8))
+    initargs = (
+        template,
+        cache.max_bytes if cache is not None else 0,
+        cache.path if cache is not None else None,
+        instrument.is_enabled(),
+    )
+    rendered = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+        for dest_path, hits, misses, records, page_references in executor.map(
+                _generate_page_task, pages, chunksize=chunksize):
+            rendered.append(dest_path)
+            if references is not None:
+                references[dest_path] = page_references
+            if on_page is not None:
+                on_page(dest_path)
+            if cache is not None:
+                cache.hits += hits
+                cache.misses += misses
+            for record in records:
+                instrument.add_page(record)
+    return rendered
+
+
+def build_site(content_dir, static_dir, template_path, dest_dir, workers=1, clean=False, cache=None,
+               compress=False):
+    # Incremental build: pages whose source and template are unchanged since the
+    # manifest was written are skipped, and outputs of deleted sources are removed.
+    # An optional BlockCache is saved back to its path after a serial build.
+    # The links and images of every page are kept in a LinkIndex next to the manifest.
+    # With compress=True, outputs get .gz (and .br) siblings on a thread pool while the
+    # remaining pages render.
+    start = time.perf_counter()
+    result = BuildResult()
+    if clean and os.path.exists(dest_dir):
+        shutil.rmtree(dest_dir)
+    os.makedirs(dest_dir, exist_ok=True)
+    manifest = load_manifest(dest_dir)
+    links = LinkIndex.load(dest_dir)
+    pages = find_pages(content_dir)
+    page_outputs = {rel_dest for _, rel_dest in pages}
+
+    compressor = Compressor() if compress else None
+    # Every copied file loses its .gz/.br siblings, which would otherwise go on being
+    # served with the old content. copy2 keeps the source mtime, so with compression on
+    # a stale sibling could look newer than the copy and survive.
+    result.copied, static_entries = copy_static(
+        static_dir, dest_dir, manifest["static"], page_outputs, remove_siblings)
+    if compressor is not None:
+        for rel_path in static_entries:
+            compressor.submit(os.path.join(dest_dir, rel_path))
+    for rel_path in manifest["static"].keys() - static_entries.keys() - page_outputs:
+        _remove_output(dest_dir, rel_path)
+        result.removed.append(rel_path)
+
+    with open(template_path, encoding="utf-8") as fp:
+        template = fp.read()
+    template_hash = hashlib.sha256(template.encode("utf-8")).hexdigest()
+    template_changed = template_hash != manifest["template"]
+
+    page_entries = {}
+    dirty = []
+    dirty_outputs = []
+    for rel_src, rel_dest in pages:
+        src_path = os.path.join(content_dir, rel_src)
+        dest_path = os.path.join(dest_dir, rel_dest)
+        mtime_ns, size = _stat_key(src_path)
+        entry = manifest["pages"].get(rel_src)
+        unchanged = (
+            entry is not None
+            and not template_changed
+            and entry["output"] == rel_dest
+            and os.path.exists(dest_path)
+            and _index_path(rel_dest) in links.pages
+        )
+        if unchanged and (entry["mtime_ns"], entry["size"]) != (mtime_ns, size):
+            # Touched but possibly not edited: fall back to the content hash.
+            unchanged = entry["hash"] == _file_hash(src_path)
+            entry = dict(entry, mtime_ns=mtime_ns, size=size)
+        if unchanged:
+            page_entries[rel_src] = entry
+            result.skipped += 1
+            if compressor is not None:
+                compressor.submit(dest_path)
+            continue
+        page_entries[rel_src] = {
+            "hash": _file_hash(src_path),
+            "mtime_ns": mtime_ns,
+            "size": size,
+            "output": rel_dest,
+        }
+        dirty.append((src_path, dest_path))
+        dirty_outputs.append(rel_dest)
+
+    kept = page_outputs | static_entries.keys()
+    for rel_src, entry in manifest["pages"].items():
+        if rel_src not in page_entries and entry["output"] not in kept:
+            _remove_output(dest_dir, entry["output"])
+            result.removed.append(entry["output"])
+
+    references = {}
+    on_page = compressor.submit if compressor is not None else remove_siblings
+    result.rendered = generate_pages(dirty, template, workers, cache, references, on_page)
+    for page in links.pages.keys() - {_index_path(rel_dest) for rel_dest in page_outputs}:
+        links.remove_page(page)
+    for (_, dest_path), rel_dest in zip(dirty, dirty_outputs):
+        links.set_page(_index_path(rel_dest), references[dest_path])
+    links.set_files(_index_path(rel_path) for rel_path in static_entries)
+    if links.changed:
+        links.save(dest_dir)
+    result.links = links
+    if cache is not None and cache.path is not None and len(cache):
+        cache.save()
+    new_manifest = {
+        "version": MANIFEST_VERSION,
+        "template": template_hash,
+        "pages": page_entries,
+        "static": static_entries,
+    }
+    if new_manifest != manifest:
+        save_manifest(dest_dir, new_manifest)
+    if compressor is not None:
+        result.compression = compressor.close()
+    result.elapsed = time.perf_counter() - start
+    return result
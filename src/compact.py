@@ -0,0 +1,174 @@
+from array import array
+
+from htmlnode import LeafNode, ParentNode, RawNode, escape_text, format_props, write_chunks
+
+NO_PROPS = -1
+
+
+class CompactDocument:
+    # A document tree stored as parallel arrays in pre-order instead of nested node objects.
+    # Node i has tag tag_names[tags[i]] (tag id 0 is None, a bare text leaf), props
+    # props[prop_ids[i]] unless NO_PROPS, and owns the children in the index range
+    # (i, ends[i]). Leaves have leaf_ids[i] >= 0; their text is
+    # text[text_offsets[k]:text_offsets[k + 1]] for k = leaf_ids[i]. Parents have -1.
+    # raw_leaves[k] is 1 when leaf k's text is already HTML and is not escaped.
+
+    def __init__(self):
+        self.tag_names = [None]
+        self._tag_ids = {None: 0}
+        self.tags = array("H")
+        self.ends = array("L")
+        self.leaf_ids = array("l")
+        self.prop_ids = array("l")
+        self.props = []
+        self.text_offsets = array("Q", [0])
+        self.raw_leaves = array("B")
+        self._text = ""
+        self._pending = []
+        self._open = []
+
+    def __len__(self):
+        return len(self.tags)
+
+    @property
+    def text(self):
+        if self._pending:
+            self._text += "".join(self._pending)
+            self._pending = []
+        return self._text
+
+    def _tag_id(self, tag):
+        tag_id = self._tag_ids.get(tag)
+        if tag_id is None:
+            tag_id = self._tag_ids[tag] = len(self.tag_names)
+            self.tag_names.append(tag)
+        return tag_id
+
+    def _prop_id(self, props):
+        if not props:
+            return NO_PROPS
+        self.props.append(props)
+        return len(self.props) - 1
+
+    def open(self, tag, props=None):
+        if tag is None:
+            raise ValueError
+        self._open.append(len(self.tags))
+        self.tags.append(self._tag_id(tag))
+        self.ends.append(0)
+        self.leaf_ids.append(-1)
+        self.prop_ids.append(self._prop_id(props))
+
+    def close(self):
+        index = self._open.pop()
+        self.ends[index] = len(self.tags)
+
+    def leaf(self, tag, value, props=None, raw=False):
+        if value is None:
+            raise ValueError
+        index = len(self.tags)
+        self.tags.append(self._tag_id(tag))
+        self.ends.append(index + 1)
+        self.leaf_ids.append(len(self.text_offsets) - 1)
+        self.prop_ids.append(self._prop_id(props))
+        self._pending.append(value)
+        self.raw_leaves.append(raw)
+        self.text_offsets.append(self.text_offsets[-1] + len(value))
+
+    def append(self, node):
+        # Flattens an HTMLNode subtree into the arrays without recursion. Children are
+        # walked with forward iterators, so lazily built children (table rows) are
+        # produced one at a time.
+        if not isinstance(node, ParentNode):
+            self._append_leaf(node)
+            return
+        self._open_parent(node)
+        stack = [iter(node.children)]
+        while stack:
+            for child in stack[-1]:
+                if isinstance(child, ParentNode):
+                    self._open_parent(child)
+                    stack.append(iter(child.children))
+                    break
+                self._append_leaf(child)
+            else:
+                stack.pop()
+                self.close()
+
+    def _open_parent(self, node):
+        if node.children is None:
+            raise ValueError("no children found!")
+        self.open(node.tag, node.props)
+
+    def _append_leaf(self, node):
+        if not isinstance(node, LeafNode):
+            raise NotImplementedError
+        self.leaf(node.tag, node.value, node.props, isinstance(node, RawNode))
+
+    def _open_tag(self, index):
+        tag = self.tag_names[self.tags[index]]
+        prop_id = self.prop_ids[index]
+        if prop_id == NO_PROPS:
+            return f"<{tag}>"
+        return f"<{tag}{format_props(self.props[prop_id])}>"
+
+    def iter_html(self):
+        if self._open:
+            raise ValueError("document has unclosed elements")
+        text = self.text
+        offsets = self.text_offsets
+        tag_names = self.tag_names
+        tags, ends, leaf_ids, prop_ids = self.tags, self.ends, self.leaf_ids, self.prop_ids
+        raw_leaves = self.raw_leaves
+        closing = []
+        for index in range(len(tags)):
+            while closing and closing[-1][0] <= index:
+                yield closing.pop()[1]
+            leaf_id = leaf_ids[index]
+            if leaf_id < 0:
+                yield self._open_tag(index)
+                closing.append((ends[index], f"</{tag_names[tags[index]]}>"))
+                continue
+            value = text[offsets[leaf_id]:offsets[leaf_id + 1]]
+            if not raw_leaves[leaf_id]:
+                value = escape_text(value)
+            tag = tag_names[tags[index]]
+            if tag is None:
+                yield value
+            elif prop_ids[index] == NO_PROPS:
+                yield f"<{tag}>{value}</{tag}>"
+            else:
+                yield f"{self._open_tag(index)}{value}</{tag}>"
+        while closing:
+            yield closing.pop()[1]
+
+    def to_html(self):
+        return "".join(self.iter_html())
+
+    def write_html(self, fp, buffer_size=65536):
+        write_chunks(fp, self.iter_html(), buffer_size)
+
+    def to_html_node(self):
+        # Converts back to an HTMLNode tree; returns the single root node.
+        text = self.text
+        offsets = self.text_offsets
+        roots = []
+        parents = []
+        for index in range(len(self.tags)):
+            while parents and parents[-1][0] <= index:
+                parents.pop()
+            siblings = parents[-1][1].children if parents else roots
+            tag = self.tag_names[self.tags[index]]
+            prop_id = self.prop_ids[index]
+            props = None if prop_id == NO_PROPS else self.props[prop_id]
+            leaf_id = self.leaf_ids[index]
+            if leaf_id < 0:
+                node = ParentNode(tag, [], props)
+                parents.append((self.ends[index], node))
+            else:
+                leaf_class = RawNode if self.raw_leaves[leaf_id] else LeafNode
+                node = leaf_class(tag, text[offsets[leaf_id]:offsets[leaf_id + 1]], props)
+            siblings.append(node)
+        if len(roots) != 1:
+            raise ValueError("document does not have a single root element")
+        return roots[0]
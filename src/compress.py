@@ -0,0 +1,122 @@
+import gzip
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SIBLING_SUFFIXES = (".gz", ".br")
+COMPRESSIBLE_SUFFIXES = (".html", ".css", ".js", ".mjs", ".json", ".svg", ".xml", ".txt", ".map")
+MIN_SIZE = 256
+
+
+def _gzip(data):
+    # mtime=0 keeps the output identical between builds of the same file.
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data):
+    return brotli.compress(data, quality=11)
+
+
+FORMATS = {"gzip": (".gz", _gzip)}
+if brotli is not None:
+    FORMATS["brotli"] = (".br", _brotli)
+
+
+def remove_siblings(path):
+    # Removes every precompressed sibling of path, including formats not installed here.
+    for suffix in SIBLING_SUFFIXES:
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+class CompressionStats:
+    def __init__(self):
+        self.written = 0
+        self.skipped = 0
+        self.original_bytes = 0
+        self.compressed_bytes = 0
+
+    @property
+    def saved(self):
+        return self.original_bytes - self.compressed_bytes
+
+    def __repr__(self):
+        return (f"CompressionStats(written={self.written}, skipped={self.skipped}, "
+                f"saved={self.saved})")
+
+
+class Compressor:
+    # Writes precompressed siblings (page.html.gz, and page.html.br when brotli is
+    # installed) on a thread pool, so files can be submitted while pages are still being
+    # rendered; zlib and brotli release the GIL while they work. A sibling newer than its
+    # source is left alone. Files that would not get smaller lose any stale sibling.
+
+    def __init__(self, formats=None, workers=None, min_size=MIN_SIZE):
+        names = list(FORMATS) if formats is None else formats
+        for name in names:
+            if name not in FORMATS:
+                raise ValueError(f"unknown or unavailable compression format: {name}")
+        self.formats = [FORMATS[name] for name in names]
+        self.min_size = min_size
+        self.stats = CompressionStats()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        self._futures = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def submit(self, path):
+        if path.endswith(COMPRESSIBLE_SUFFIXES):
+            self._futures.append(self._executor.submit(self._compress, path))
+
+    def _compress(self, path):
+        stat = os.stat(path)
+        if stat.st_size < self.min_size:
+            remove_siblings(path)
+            return
+        data = None
+        for suffix, compress in self.formats:
+            target = path + suffix
+            try:
+                if os.stat(target).st_mtime_ns >= stat.st_mtime_ns:
+                    with self._lock:
+                        self.stats.skipped += 1
+                    continue
+            except FileNotFoundError:
+                pass
+            if data is None:
+                with open(path, "rb") as fp:
+                    data = fp.read()
+            compressed = compress(data)
+            if len(compressed) >= len(data):
+                try:
+                    os.remove(target)
+                except FileNotFoundError:
+                    pass
+                continue
+            with open(target + ".tmp", "wb") as fp:
+                fp.write(compressed)
+            os.replace(target + ".tmp", target)
+            with self._lock:
+                self.stats.written += 1
+                self.stats.original_bytes += len(data)
+                self.stats.compressed_bytes += len(compressed)
+
+    def close(self):
+        # Waits for every submitted file and returns the stats; errors are re-raised here.
+        self._executor.shutdown(wait=True)
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+        return self.stats
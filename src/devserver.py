@@ -0,0 +1,241 @@
+import asyncio
+import mimetypes
+import os
+import time
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
+
+from build import MARKDOWN_SUFFIX, build_site, generate_page
+
+EVENTS_PATH = "/__events"
+RELOAD_SCRIPT = (
+    b'<script>new EventSource("' + EVENTS_PATH.encode() + b'")'
+    b'.addEventListener("reload", () => location.reload());</script>'
+)
+HEARTBEAT_SECONDS = 15
+MAX_HEADER_BYTES = 16 * 1024
+
+
+def inject_reload_script(html):
+    index = html.rfind(b"</body>")
+    if index == -1:
+        return html + RELOAD_SCRIPT
+    return html[:index] + RELOAD_SCRIPT + html[index:]
+
+
+def snapshot(*paths):
+    # Maps every non-hidden file under the given files or directories to (mtime_ns, size).
+    files = {}
+    for path in paths:
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            files[path] = (stat.st_mtime_ns, stat.st_size)
+            continue
+        for root, dirs, names in os.walk(path):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for name in names:
+                if name.startswith("."):
+                    continue
+                full_path = os.path.join(root, name)
+                try:
+                    stat = os.stat(full_path)
+                except FileNotFoundError:
+                    continue
+                files[full_path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def changed_paths(old, new):
+    return {path for path in old.keys() | new.keys() if old.get(path) != new.get(path)}
+
+
+class DevServer:
+    # Serves the built site, watches the sources and pushes "reload" events over SSE.
+    # Renders run in a process pool so the event loop keeps serving while pages build.
+
+    def __init__(self, content_dir, static_dir, template_path, dest_dir,
+                 debounce=0.2, poll_interval=0.25, workers=1):
+        self.content_dir = content_dir
+        self.static_dir = static_dir
+        self.template_path = template_path
+        self.dest_dir = dest_dir
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.clients = set()
+        self.rebuilds = 0
+        self._server = None
+        self._watcher = None
+
+    async def start(self, host="127.0.0.1", port=8888):
+        await asyncio.to_thread(build_site, self.content_dir, self.static_dir, self.template_path, self.dest_dir)
+        self._server = await asyncio.start_server(self._handle, host, port, limit=MAX_HEADER_BYTES)
+        self._watcher = asyncio.create_task(self.watch())
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._watcher is not None:
+            self._watcher.cancel()
+        for queue in self.clients:
+            queue.put_nowait(None)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def broadcast(self, event, data=""):
+        for queue in self.clients:
+            queue.put_nowait((event, data))
+
+    async def watch(self):
+        # Polls the sources; a burst of saves is collected until nothing has changed
+        # for `debounce` seconds, then handled as one rebuild.
+        sources = (self.content_dir, self.static_dir, self.template_path)
+        current = await asyncio.to_thread(snapshot, *sources)
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            latest = await asyncio.to_thread(snapshot, *sources)
+            changed = changed_paths(current, latest)
+            if not changed:
+                continue
+            quiet_since = time.monotonic()
+            while time.monotonic() - quiet_since < self.debounce:
+                await asyncio.sleep(min(self.poll_interval, self.debounce))
+                newer = await asyncio.to_thread(snapshot, *sources)
+                more = changed_paths(latest, newer)
+                if more:
+                    changed |= more
+                    quiet_since = time.monotonic()
+                latest = newer
+            current = latest
+            try:
+                await self.rebuild(changed)
+            except Exception as error:
+                # A page that fails to render must not stop the watcher.
+                print(f"rebuild failed: {error!r}")
+
+    async def rebuild(self, changed):
+        # Changed markdown pages are re-rendered one by one; anything else (template,
+        # static files, including .md ones, deleted pages) goes through an incremental build_site.
+        content_root = os.path.join(self.content_dir, "")
+        pages = [
+            path for path in changed
+            if path.startswith(content_root) and path.endswith(MARKDOWN_SUFFIX) and os.path.exists(path)
+        ]
+        if len(pages) == len(changed):
+            with open(self.template_path, encoding="utf-8") as fp:
+                template = fp.read()
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(
+                loop.run_in_executor(self.executor, generate_page, path, template, self._dest_path(path))
+                for path in pages
+            ))
+        else:
+            await asyncio.to_thread(build_site, self.content_dir, self.static_dir, self.template_path, self.dest_dir)
+        self.rebuilds += 1
+        self.broadcast("reload", str(len(changed)))
+
+    def _dest_path(self, src_path):
+        rel_path = os.path.relpath(src_path, self.content_dir)
+        return os.path.join(self.dest_dir, rel_path[:-len(MARKDOWN_SUFFIX)] + ".html")
+
+    def _resolve(self, url_path):
+        # Maps a URL path to a file under dest_dir, refusing anything outside it.
+        root = os.path.realpath(self.dest_dir)
+        try:
+            path = os.path.realpath(os.path.join(root, url_path.lstrip("/")))
+        except ValueError:
+            # An embedded NUL byte (/%00) is not a path at all.
+            return None
+        if path != root and not path.startswith(root + os.sep):
+            return None
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+        elif not os.path.exists(path) and os.path.exists(path + ".html"):
+            path += ".html"
+        return path if os.path.isfile(path) else None
+
+    async def _handle(self, reader, writer):
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        try:
+            method, target, _ = request.split(b"\r\n", 1)[0].decode("latin-1").split(" ", 2)
+        except ValueError:
+            await self._respond(writer, 400, b"bad request")
+            return
+        url_path = urllib.parse.unquote(urllib.parse.urlsplit(target).path)
+        if method not in ("GET", "HEAD"):
+            await self._respond(writer, 405, b"method not allowed")
+        elif url_path == EVENTS_PATH:
+            await self._serve_events(writer)
+        else:
+            await self._serve_file(writer, url_path, method == "HEAD")
+
+    async def _respond(self, writer, status, body, content_type="text/plain; charset=utf-8", head=False):
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}[status]
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nCache-Control: no-store\r\nConnection: close\r\n\r\n".encode()
+        )
+        if not head:
+            writer.write(body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def _serve_file(self, writer, url_path, head):
+        path = self._resolve(url_path)
+        if path is None:
+            await self._respond(writer, 404, b"not found", head=head)
+            return
+        body = await asyncio.to_thread(_read_bytes, path)
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if content_type == "text/html":
+            body = inject_reload_script(body)
+            content_type += "; charset=utf-8"
+        await self._respond(writer, 200, body, content_type, head)
+
+    async def _serve_events(self, writer):
+        queue = asyncio.Queue()
+        self.clients.add(queue)
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-store\r\n\r\n")
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    writer.write(b": ping\n\n")
+                else:
+                    if message is None:
+                        break
+                    event, data = message
+                    writer.write(f"event: {event}\ndata: {data}\n\n".encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(queue)
+            writer.close()
+
+
+def _read_bytes(path):
+    with open(path, "rb") as fp:
+        return fp.read()
+
+
+async def serve(content_dir, static_dir, template_path, dest_dir, host="127.0.0.1", port=8888, workers=1):
+    server = DevServer(content_dir, static_dir, template_path, dest_dir, workers=workers)
+    host, port = await server.start(host, port)
+    print(f"Serving {dest_dir} on http://{host}:{port}/ (watching {content_dir}, Ctrl+C to stop)")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
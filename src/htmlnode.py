@@ -1,34 +1,89 @@
 from textnode import TextType,TextNode
 
 
+def escape_text(text):
+    # Most text has nothing to escape, and the membership tests are far cheaper than
+    # replace() or str.translate() on the short strings a page is made of.
+    if "&" in text or "<" in text or ">" in text:
+        return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text
+
+def escape_attribute(value):
+    if "&" in value or "<" in value or ">" in value or '"' in value:
+        return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+    return value
+
+def write_chunks(fp, chunks, buffer_size=65536):
+    # Writes an iterable of strings to fp, batching small chunks into writes of about
+    # buffer_size characters.
+    buffer = []
+    size = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= buffer_size:
+            fp.write("".join(buffer))
+            buffer = []
+            size = 0
+    if buffer:
+        fp.write("".join(buffer))
+
+_PROPS_CACHE_SIZE = 4096
+_props_cache = {}
+
+def _format_items(items):
+    return "".join([f' {prop}="{escape_attribute(str(value))}"' for prop, value in items])
+
+def format_props(props):
+    # Galleries and link lists repeat the same attributes, so formatted strings are cached
+    # by their (name, value) pairs. The cache is simply emptied when it fills up.
+    if not props:
+        return ""
+    items = tuple(props.items())
+    try:
+        html = _props_cache.get(items)
+    except TypeError:
+        return _format_items(items)
+    if html is None:
+        html = _format_items(items)
+        # Only string values are cached: 1, 1.0 and True are equal as dict keys but format
+        # differently, and a key made of strings can never equal one that holds them.
+        if all(type(value) is str for _, value in items):
+            if len(_props_cache) >= _PROPS_CACHE_SIZE:
+                _props_cache.clear()
+            _props_cache[items] = html
+    return html
+
 
 class HTMLNode:
+    # Slotted: pages allocate millions of nodes, so there is no per-instance __dict__.
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self,tag=None,value=None,children=None,props=None):
         self.tag = tag
         self.value = value
         self.children = children
         self.props = props
-        if self.value == None:
-            self.value = children
-        if self.children == None:
-            self.children = value
 
-    def to_html(self):
+    def iter_html(self, visit=None):
         raise NotImplementedError
+
+    def to_html(self):
+        return "".join(self.iter_html())
+
+    def write_html(self, fp, buffer_size=65536):
+        write_chunks(fp, self.iter_html(), buffer_size)
     
     def props_to_html(self):
-        if self.props is None:
-            return ""
-        props_html = ""
-        for prop in self.props:
-            props_html += f' {prop}="{self.props[prop]}"'
-        return props_html
+        return format_props(self.props)
         
     def __repr__(self):
         return f"HTMLNode(tag={self.tag}, value={self.value}, children={self.children}, props={self.props})"
     
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self,tag,value,props=None):
         super().__init__(tag, value, None, props)
 
@@ -36,39 +91,180 @@ class LeafNode(HTMLNode):
         if self.value == None:
             raise ValueError
         if self.tag is None:
-            return self.value
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+            return escape_text(self.value)
+        return f"<{self.tag}{format_props(self.props)}>{escape_text(self.value)}</{self.tag}>"
+
+    def iter_html(self, visit=None):
+        if visit is not None:
+            visit(self)
+        yield self.to_html()
     
     def __repr__(self):
         return f"LeafNode(tag={self.tag}, value={self.value}, props={self.props})"
     
+class RawNode(LeafNode):
+    # A leaf whose value is already HTML (or already escaped) and is written as-is.
+    __slots__ = ()
+
+    def to_html(self):
+        if self.value == None:
+            raise ValueError
+        if self.tag is None:
+            return self.value
+        return f"<{self.tag}{format_props(self.props)}>{self.value}</{self.tag}>"
+
+    def __repr__(self):
+        return f"RawNode(tag={self.tag}, value={self.value}, props={self.props})"
+
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         super().__init__(tag, None, children, props)
 
-    def to_html(self):
+    def open_tag(self):
         if self.tag is None:
             raise ValueError
         if self.children is None:
             raise ValueError("no children found!")
-        return f"<{self.tag}{self.props_to_html()}>{"".join([child.to_html() for child in self.children])}</{self.tag}>"
+        return f"<{self.tag}{self.props_to_html()}>"
+
+    def iter_html(self, visit=None):
+        # Walks the tree with an explicit stack so deep nesting cannot hit the recursion limit.
+        # visit, if given, is called with every node in document order as it is written,
+        # so a caller can inspect the tree without walking it a second time.
+        if visit is not None:
+            visit(self)
+        yield self.open_tag()
+        stack = [(iter(self.children), f"</{self.tag}>")]
+        while stack:
+            children, closing_tag = stack[-1]
+            for child in children:
+                if visit is not None:
+                    visit(child)
+                if isinstance(child, ParentNode):
+                    yield child.open_tag()
+                    stack.append((iter(child.children), f"</{child.tag}>"))
+                    break
+                if isinstance(child, LeafNode):
+                    yield child.to_html()
+                else:
+                    yield from child.iter_html(visit)
+            else:
+                stack.pop()
+                yield closing_tag
+
 
 
+_INLINE_RENDERERS = {}
+
+def register_inline_type(text_type, to_html_node, to_html=None, keep_node=False):
+    # Registers how TextNodes of text_type are rendered; text_type may be any hashable
+    # value, so custom inline types need not be TextType members. to_html_node(text_node)
+    # returns an HTMLNode and to_html(text_node) the same HTML as a string, without
+    # building the node. keep_node marks types whose nodes later stages read back out
+    # of the tree (the link index collects <a> and <img>), so they are never flattened.
+    if to_html is None:
+        to_html = lambda text_node: to_html_node(text_node).to_html()
+    _INLINE_RENDERERS[text_type] = (to_html_node, to_html, keep_node)
 
 def text_node_to_html_node(text_node):
-    match text_node.text_type:
-        case TextType.TEXT:
-            return LeafNode(None,text_node.text,None)
-        case TextType.BOLD:
-            return LeafNode("b",text_node.text,None)
-        case TextType.ITALIC:
-            return LeafNode("i",text_node.text,None)
-        case TextType.CODE:
-            return LeafNode("code",text_node.text,None)
-        case TextType.LINK:
-            return LeafNode("a",text_node.text,{"href":text_node.url})
-        case TextType.IMAGE:
-            return LeafNode("img","",{"src": text_node.url, "alt": text_node.text})
-        case _:
-            raise Exception("Texttype dont exist")
+    renderer = _INLINE_RENDERERS.get(text_node.text_type)
+    if renderer is None:
+        raise ValueError(f"unknown text type: {text_node.text_type}")
+    return renderer[0](text_node)
+
+def text_nodes_to_html(text_nodes):
+    # The HTML of a run of TextNodes, written straight from the registered emitters.
+    renderers = _INLINE_RENDERERS
+    parts = []
+    for text_node in text_nodes:
+        renderer = renderers.get(text_node.text_type)
+        if renderer is None:
+            raise ValueError(f"unknown text type: {text_node.text_type}")
+        parts.append(renderer[1](text_node))
+    return "".join(parts)
+
+def _contains_kept_node(text_nodes):
+    for text_node in text_nodes:
+        renderer = _INLINE_RENDERERS.get(text_node.text_type)
+        if renderer is None or renderer[2]:
+            return True
+        if text_node.children is not None and _contains_kept_node(text_node.children):
+            return True
+    return False
+
+def text_nodes_to_children(text_nodes):
+    # Converts the inline nodes of a block: each run of flattenable nodes is written
+    # straight to HTML and kept as one RawNode, instead of a LeafNode per text node;
+    # only types registered with keep_node, such as links and images, become nodes,
+    # along with any emphasis that has one nested inside it.
+    renderers = _INLINE_RENDERERS
+    children = []
+    parts = []
+    for text_node in text_nodes:
+        renderer = renderers.get(text_node.text_type)
+        if renderer is None:
+            raise ValueError(f"unknown text type: {text_node.text_type}")
+        if renderer[2] or (text_node.children is not None and _contains_kept_node(text_node.children)):
+            if parts:
+                children.append(RawNode(None, "".join(parts)))
+                parts = []
+            children.append(renderer[0](text_node))
+        else:
+            parts.append(renderer[1](text_node))
+    if parts:
+        children.append(RawNode(None, "".join(parts)))
+    return children
+
+def _nested_html_node(tag, text_node, props=None):
+    # Nested inline markup, e.g. **bold _italic_**, becomes a parent of converted children.
+    if text_node.children is None:
+        return LeafNode(tag, text_node.text, props)
+    return ParentNode(tag, [text_node_to_html_node(child) for child in text_node.children], props)
+
+def _inner_html(text_node):
+    if text_node.children is None:
+        return escape_text(text_node.text)
+    return text_nodes_to_html(text_node.children)
+
+def _register_tag(text_type, tag):
+    # Opening and closing tags are formatted once here rather than for every node.
+    opening = f"<{tag}>"
+    closing = f"</{tag}>"
+    register_inline_type(
+        text_type,
+        lambda text_node: _nested_html_node(tag, text_node),
+        lambda text_node: opening + _inner_html(text_node) + closing,
+    )
+
+def _link_html(text_node):
+    return f'<a href="{escape_attribute(str(text_node.url))}">{_inner_html(text_node)}</a>'
+
+def _image_html(text_node):
+    return f'<img src="{escape_attribute(str(text_node.url))}" alt="{escape_attribute(text_node.text)}"></img>'
 
+register_inline_type(
+    TextType.TEXT,
+    lambda text_node: LeafNode(None, text_node.text),
+    lambda text_node: escape_text(text_node.text),
+)
+_register_tag(TextType.BOLD, "b")
+_register_tag(TextType.ITALIC, "i")
+register_inline_type(
+    TextType.CODE,
+    lambda text_node: LeafNode("code", text_node.text),
+    lambda text_node: "<code>" + escape_text(text_node.text) + "</code>",
+)
+register_inline_type(
+    TextType.LINK,
+    lambda text_node: _nested_html_node("a", text_node, {"href": text_node.url}),
+    _link_html,
+    keep_node=True,
+)
+register_inline_type(
+    TextType.IMAGE,
+    lambda text_node: LeafNode("img", "", {"src": text_node.url, "alt": text_node.text}),
+    _image_html,
+    keep_node=True,
+)
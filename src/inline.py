@@ -1,5 +1,7 @@
 from textnode import TextNode, TextType
 import re
+import string
+import unicodedata
 
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
     new_nodes = []
@@ -23,67 +25,331 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
     return new_nodes
 
 
+_IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+_LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
 def extract_markdown_images(text):
-    extracted = re.findall(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
+    extracted = _IMAGE_PATTERN.findall(text)
     return extracted
 
 def extract_markdown_links(text):
-    extracted = re.findall(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
+    extracted = _LINK_PATTERN.findall(text)
     return extracted
-    
-def split_nodes_images(old_nodes):
+
+def _split_nodes_pattern(old_nodes, pattern, text_type):
+    # Walk the match spans once per node, slicing only at match boundaries.
     new_nodes = []
     for nodes in old_nodes:
         if nodes.text_type != TextType.TEXT:
             new_nodes.append(nodes)
             continue
-        splits = extract_markdown_images(nodes.text)
-        if len(splits) == 0:
+        text = nodes.text
+        position = 0
+        for match in pattern.finditer(text):
+            if match.start() != position:
+                new_nodes.append(TextNode(text[position:match.start()], TextType.TEXT))
+            new_nodes.append(TextNode(match[1], text_type, match[2]))
+            position = match.end()
+        if position == 0:
             new_nodes.append(nodes)
-            continue
-        else:
-            current_text = nodes.text
-            for alt_text, url in splits:
-                current_text = current_text.split(f"![{alt_text}]({url})", 1)
-                if current_text[0] != "":
-                    new_nodes.append(TextNode(current_text[0], TextType.TEXT))
-                new_nodes.append(TextNode(alt_text, TextType.IMAGE, url))
-                current_text = current_text[1]
-            if current_text != "":
-                new_nodes.append(TextNode(current_text, TextType.TEXT))
+        elif position != len(text):
+            new_nodes.append(TextNode(text[position:], TextType.TEXT))
     return new_nodes
 
+def split_nodes_images(old_nodes):
+    return _split_nodes_pattern(old_nodes, _IMAGE_PATTERN, TextType.IMAGE)
+
 def split_nodes_links(old_nodes):
-    new_nodes = []
-    for nodes in old_nodes:
-        if nodes.text_type != TextType.TEXT:
-            new_nodes.append(nodes)
+    return _split_nodes_pattern(old_nodes, _LINK_PATTERN, TextType.LINK)
+
+# The leading lookahead lets the regex engine skip to the next markup character with a
+# set lookup; without it, every alternative is tried at every position of plain text.
+_TOKEN_PATTERN = re.compile(
+    r"(?=[`!\[*_])(?:"
+    r"(?P<ticks>`+)"
+    r"|!\[(?P<alt>[^\[\]]*)\]\((?P<src>[^\(\)]*)\)"
+    r"|(?<!!)\[(?P<anchor>[^\[\]]*)\]\((?P<href>[^\(\)]*)\)"
+    r"|(?P<simple>\*\*|__|\*|_)(?P<inner>[^*_`\[]++)(?P=simple)"
+    r"|(?P<run>\*+|_+)"
+    r")"
+)
+_MARKUP_CHARS = ("`", "*", "_", "[")
+_BACKTICK_RUN = re.compile(r"`+")
+# Emphasis nested deeper than this is left as literal delimiters, which bounds the depth
+# of the node tree (and of every recursive walk over it) whatever the input.
+MAX_INLINE_NESTING = 32
+_ASCII_PUNCTUATION = frozenset(string.punctuation)
+_SPACE_BEFORE = frozenset(" \t\n(")
+_SPACE_OR_PUNCT_AFTER = frozenset(" \t\n.,;:!?)")
+
+def _code_spans(text):
+    # Maps the start of each backtick run that opens a code span to the end of its closing
+    # run: the next run of exactly the same length. Runs are queued by length and each
+    # queue is only read forwards, so unclosed runs cannot make the scan quadratic.
+    runs = [(match.start(), match.end()) for match in _BACKTICK_RUN.finditer(text)]
+    queues = {}
+    for start, end in runs:
+        queues.setdefault(end - start, []).append((start, end))
+    heads = dict.fromkeys(queues, 0)
+    spans = {}
+    covered = 0
+    for start, end in runs:
+        if start < covered:
             continue
-        splits = extract_markdown_links(nodes.text)
-        if len(splits) == 0:
-            new_nodes.append(nodes)
+        length = end - start
+        queue = queues[length]
+        head = heads[length]
+        while head < len(queue) and queue[head][0] <= start:
+            head += 1
+        heads[length] = head
+        if head < len(queue):
+            spans[start] = queue[head]
+            covered = queue[head][1]
+            heads[length] = head + 1
+    return spans
+
+def _code_text(text):
+    # As in CommonMark, one space is stripped from each side when both are present.
+    text = text.replace("\n", " ")
+    if len(text) > 2 and text[0] == " " and text[-1] == " " and not text.isspace():
+        return text[1:-1]
+    return text
+
+def _is_punctuation(char):
+    return char in _ASCII_PUNCTUATION or (char > "\x7f" and unicodedata.category(char)[0] in "PS")
+
+
+class _Delimiter:
+    # A run of * or _ that may open and/or close emphasis. Runs form a linked list that
+    # matching shrinks; opens and closes record the widths (1 or 2) of the matches made.
+    __slots__ = ("char", "count", "length", "can_open", "can_close", "position",
+                 "prev", "next", "opens", "closes")
+
+    def __init__(self, char, length, can_open, can_close, position):
+        self.char = char
+        self.count = length
+        self.length = length
+        self.can_open = can_open
+        self.can_close = can_close
+        self.position = position
+        self.prev = None
+        self.next = None
+        self.opens = []
+        self.closes = []
+
+    def unlink(self):
+        if self.prev is not None:
+            self.prev.next = self.next
+        if self.next is not None:
+            self.next.prev = self.prev
+
+
+def _flanking(text, start, end):
+    # Returns (can_open, can_close) for the run text[start:end], by CommonMark's flanking
+    # rules; the start and end of the text count as whitespace.
+    char = text[start]
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    before_space, after_space = before.isspace(), after.isspace()
+    before_punct, after_punct = _is_punctuation(before), _is_punctuation(after)
+    left = not after_space and (not after_punct or before_space or before_punct)
+    right = not before_space and (not before_punct or after_space or after_punct)
+    if char == "*":
+        can_open, can_close = left, right
+    else:
+        # _ does not open or close inside a word, so snake_case stays as written.
+        can_open = left and (not right or before_punct)
+        can_close = right and (not left or after_punct)
+    return can_open, can_close
+
+
+def _is_simple_pair(text, start, end, width):
+    # A pair of equal runs around plain text always matches each other when the first can
+    # only open and the second can only close: no other delimiter can claim either of them.
+    char = text[start]
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    if before == char or after == char:
+        return False
+    # The usual case, **word** between spaces or before ordinary punctuation, is settled
+    # without the full flanking rules: it opens and closes exactly as a simple pair must.
+    if (before in _SPACE_BEFORE and after in _SPACE_OR_PUNCT_AFTER
+            and text[start + width].isalnum() and text[end - width - 1].isalnum()):
+        return True
+    return _flanking(text, start, start + width) == (True, False) and _flanking(text, end - width, end) == (False, True)
+
+
+def _process_emphasis(first):
+    # Matches closers with the nearest compatible opener, as in CommonMark's "process
+    # emphasis". After a failed search, the delimiters already examined are never searched
+    # again for the same kind of closer, so the whole pass is linear.
+    floors = {}
+    closer = first
+    while closer is not None:
+        if not closer.can_close:
+            closer = closer.next
             continue
+        key = (closer.char, closer.can_open, closer.length % 3)
+        floor = floors.get(key, -1)
+        opener = closer.prev
+        while opener is not None and opener.position > floor:
+            if opener.char == closer.char and opener.can_open and not (
+                (opener.can_close or closer.can_open)
+                and (opener.length + closer.length) % 3 == 0
+                and (opener.length % 3 or closer.length % 3)
+            ):
+                break
+            opener = opener.prev
         else:
-            current_text = nodes.text
-            for link_text, url in splits:
-                current_text = current_text.split(f"[{link_text}]({url})", 1)
-                if current_text[0] != "":
-                    new_nodes.append(TextNode(current_text[0], TextType.TEXT))
-                new_nodes.append(TextNode(link_text, TextType.LINK, url))
-                current_text = current_text[1]
-            if current_text != "":
-                new_nodes.append(TextNode(current_text, TextType.TEXT))
-    return new_nodes            
+            opener = None
+        if opener is not None:
+            width = 2 if opener.count >= 2 and closer.count >= 2 else 1
+            opener.count -= width
+            closer.count -= width
+            opener.opens.append(width)
+            closer.closes.append(width)
+            # Runs between the pair can no longer match anything: they stay literal text.
+            opener.next = closer
+            closer.prev = opener
+            if opener.count == 0:
+                opener.unlink()
+            if closer.count == 0:
+                following = closer.next
+                closer.unlink()
+                closer = following
+        else:
+            floors[key] = closer.prev.position if closer.prev is not None else -1
+            following = closer.next
+            if not closer.can_open:
+                closer.unlink()
+            closer = following
+
+
+def _emphasis_node(width, children):
+    text_type = TextType.BOLD if width == 2 else TextType.ITALIC
+    if len(children) == 1 and children[0].text_type == TextType.TEXT:
+        return TextNode(children[0].text, text_type)
+    return TextNode("".join(child.text for child in children), text_type, None, children)
+
+
+def _build_tree(items):
+    # One pass over the tokens: matched delimiters open and close nested nodes, unmatched
+    # ones are literal text, and adjacent text is merged into a single node.
+    root = []
+    children = root
+    stack = []
+    pending = []
+    for item in items:
+        if type(item) is str:
+            pending.append(item)
+            continue
+        if type(item) is TextNode:
+            if pending:
+                children.append(TextNode("".join(pending), TextType.TEXT))
+                pending = []
+            children.append(item)
+            continue
+        for width in item.closes:
+            parent = stack.pop()
+            if parent is None:
+                pending.append(item.char * width)
+                continue
+            if pending:
+                children.append(TextNode("".join(pending), TextType.TEXT))
+                pending = []
+            parent.append(_emphasis_node(width, children))
+            children = parent
+        if item.count:
+            pending.append(item.char * item.count)
+        for width in reversed(item.opens):
+            if len(stack) >= MAX_INLINE_NESTING:
+                # Too deep: this pair is kept as text; None tells its closer to do the same.
+                pending.append(item.char * width)
+                stack.append(None)
+                continue
+            if pending:
+                children.append(TextNode("".join(pending), TextType.TEXT))
+                pending = []
+            stack.append(children)
+            children = []
+    if pending:
+        children.append(TextNode("".join(pending), TextType.TEXT))
+    return root
+
+
+def _link_node(anchor, href):
+    if not any(char in anchor for char in _MARKUP_CHARS):
+        return TextNode(anchor, TextType.LINK, href)
+    children = text_to_textnodes(anchor)
+    if len(children) == 1 and children[0].text_type == TextType.TEXT:
+        return TextNode(anchor, TextType.LINK, href)
+    return TextNode("".join(child.text for child in children), TextType.LINK, href, children)
+
+
+def _add_run(items, runs, text, start, end):
+    # Returns True when the run can neither open nor close and was added as plain text.
+    can_open, can_close = _flanking(text, start, end)
+    if not (can_open or can_close):
+        items.append(text[start:end])
+        return True
+    delimiter = _Delimiter(text[start], end - start, can_open, can_close, len(items))
+    runs.append(delimiter)
+    items.append(delimiter)
+    return False
+
 
 def text_to_textnodes(text):
+    # Code spans, images, links and simple emphasis pairs are tokenized in one scan; other
+    # * and _ runs are then paired up by the delimiter stack, and the result is a list of
+    # possibly nested TextNodes. Delimiters that cannot be matched stay literal text.
     if text == "":
         return []
-    filter_code = split_nodes_delimiter([TextNode(text, TextType.TEXT)], "`", TextType.CODE)
-    filter_images = split_nodes_images(filter_code)
-    filter_links = split_nodes_links(filter_images)
-    filter_bold = split_nodes_delimiter(filter_links, "**", TextType.BOLD)
-    filter_italic = split_nodes_delimiter(filter_bold, "_", TextType.ITALIC)
-    filter_italicalt = split_nodes_delimiter(filter_italic, "*", TextType.ITALIC)
-    return filter_italicalt
-
-
+    if not any(char in text for char in _MARKUP_CHARS):
+        return [TextNode(text, TextType.TEXT)]
+    items = []
+    runs = []
+    literal = False
+    spans = _code_spans(text) if "`" in text else None
+    position = 0
+    search = _TOKEN_PATTERN.search
+    while (match := search(text, position)) is not None:
+        start, end = match.span()
+        if start != position:
+            items.append(text[position:start])
+        position = end
+        kind = match.lastgroup
+        if kind == "inner":
+            width = len(match["simple"])
+            if _is_simple_pair(text, start, end, width):
+                items.append(TextNode(match["inner"], TextType.BOLD if width == 2 else TextType.ITALIC))
+                continue
+            # Not a simple pair: take the opening run on its own and rescan after it.
+            position = start + width
+            while text[position:position + 1] == text[start]:
+                position += 1
+            literal |= _add_run(items, runs, text, start, position)
+        elif kind == "run":
+            literal |= _add_run(items, runs, text, start, end)
+        elif kind == "ticks":
+            span = spans.get(start)
+            if span is None:
+                items.append(match["ticks"])
+                literal = True
+            else:
+                items.append(TextNode(_code_text(text[end:span[0]]), TextType.CODE))
+                position = span[1]
+        elif kind == "src":
+            items.append(TextNode(match["alt"], TextType.IMAGE, match["src"]))
+        else:
+            items.append(_link_node(match["anchor"], match["href"]))
+    if position != len(text):
+        items.append(text[position:])
+    if not runs and not literal:
+        # Only text between tokens is left as strings, and no two of those are adjacent.
+        return [TextNode(item, TextType.TEXT) if type(item) is str else item for item in items]
+    if runs:
+        for previous, delimiter in zip(runs, runs[1:]):
+            previous.next = delimiter
+            delimiter.prev = previous
+        _process_emphasis(runs[0])
+    return _build_tree(items)
@@ -0,0 +1,187 @@
+import json
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+import blocks
+from htmlnode import HTMLNode
+
+ENV_VAR = "SSG_PROFILE"
+STAGES = ("block_to_block_type", "text_to_textnodes", "text_nodes_to_children", "to_html")
+
+
+class PipelineStats:
+    def __init__(self):
+        self.seconds = Counter()
+        self.calls = Counter()
+        self.blocks = Counter()
+        self.text_nodes = Counter()
+        self.bytes_emitted = 0
+        self.pages = []
+
+    def snapshot(self):
+        return {
+            "seconds": dict(self.seconds),
+            "calls": dict(self.calls),
+            "blocks": dict(self.blocks),
+            "text_nodes": dict(self.text_nodes),
+            "bytes": self.bytes_emitted,
+        }
+
+    def add(self, record):
+        self.seconds.update(record["seconds"])
+        self.calls.update(record["calls"])
+        self.blocks.update(record["blocks"])
+        self.text_nodes.update(record["text_nodes"])
+        self.bytes_emitted += record["bytes"]
+
+
+_stats = None
+_originals = {}
+
+
+def enabled_from_env():
+    return os.environ.get(ENV_VAR, "") not in ("", "0")
+
+
+def is_enabled():
+    return _stats is not None
+
+
+def stats():
+    return _stats
+
+
+def _wrap(stage, func, observe):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        _stats.seconds[stage] += time.perf_counter() - start
+        _stats.calls[stage] += 1
+        observe(result)
+        return result
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def _count_block(block_type):
+    _stats.blocks[block_type.name] += 1
+
+
+def _count_text_nodes(text_nodes):
+    counts = _stats.text_nodes
+    for node in text_nodes:
+        counts[node.text_type.name] += 1
+
+
+def _count_bytes(html):
+    _stats.bytes_emitted += len(html)
+
+
+def enable():
+    # Swaps timing wrappers into the pipeline; while disabled the original functions
+    # are called directly, so instrumentation costs nothing.
+    global _stats
+    if _stats is not None:
+        return
+    _stats = PipelineStats()
+    targets = [
+        (blocks, "block_to_block_type", _count_block),
+        (blocks, "text_to_textnodes", _count_text_nodes),
+        (blocks, "text_nodes_to_children", lambda children: None),
+        (HTMLNode, "to_html", _count_bytes),
+    ]
+    for owner, name, observe in targets:
+        original = owner.__dict__[name]
+        _originals[(owner, name)] = original
+        setattr(owner, name, _wrap(name, original, observe))
+
+
+def _timed_chunks(chunks):
+    chunks = iter(chunks)
+    while True:
+        start = time.perf_counter()
+        chunk = next(chunks, None)
+        _stats.seconds["to_html"] += time.perf_counter() - start
+        if chunk is None:
+            break
+        _stats.bytes_emitted += len(chunk)
+        yield chunk
+    _stats.calls["to_html"] += 1
+
+
+def stream(chunks):
+    # Counts a streamed serialization, such as node.iter_html(), in the to_html stage.
+    # Returns chunks itself while disabled.
+    if _stats is None:
+        return chunks
+    return _timed_chunks(chunks)
+
+
+def disable():
+    global _stats
+    for (owner, name), original in _originals.items():
+        setattr(owner, name, original)
+    _originals.clear()
+    _stats = None
+
+
+@contextmanager
+def _page(path):
+    before = _stats.snapshot()
+    start = time.perf_counter()
+    record = {"path": path}
+    yield record
+    after = _stats.snapshot()
+    record["total"] = time.perf_counter() - start
+    for key in ("seconds", "calls", "blocks", "text_nodes"):
+        record[key] = {name: value - before[key].get(name, 0) for name, value in after[key].items()
+                       if value != before[key].get(name, 0)}
+    record["bytes"] = after["bytes"] - before["bytes"]
+    _stats.pages.append(record)
+
+
+def page(path):
+    # Records the stage timings and counters of rendering one page.
+    if _stats is None:
+        return nullcontext()
+    return _page(path)
+
+
+def pop_pages():
+    pages = _stats.pages
+    _stats.pages = []
+    return pages
+
+
+def add_page(record):
+    # Merges a page record produced by another process.
+    _stats.add(record)
+    _stats.pages.append(record)
+
+
+def format_report(top=20):
+    lines = ["Render pipeline profile", ""]
+    total = sum(_stats.seconds[stage] for stage in STAGES) or 1
+    lines.append(f"{'stage':<24} {'calls':>10} {'seconds':>10} {'share':>7}")
+    for stage in STAGES:
+        seconds = _stats.seconds[stage]
+        lines.append(f"{stage:<24} {_stats.calls[stage]:>10} {seconds:>10.3f} {seconds / total:>7.1%}")
+    lines.append("")
+    lines.append("blocks: " + ", ".join(f"{name}={count}" for name, count in _stats.blocks.most_common()))
+    lines.append("text nodes: " + ", ".join(f"{name}={count}" for name, count in _stats.text_nodes.most_common()))
+    lines.append(f"bytes emitted: {_stats.bytes_emitted}")
+    pages = sorted(_stats.pages, key=lambda record: record["total"], reverse=True)[:top]
+    if pages:
+        lines.append("")
+        lines.append(f"slowest {len(pages)} of {len(_stats.pages)} pages:")
+        for record in pages:
+            stages = " ".join(f"{stage}={record['seconds'].get(stage, 0):.3f}" for stage in STAGES)
+            lines.append(f"{record['total']:>9.3f}s  {record['path']}  {stages}  bytes={record['bytes']}")
+    return "\n".join(lines)
+
+
+def dump(fp):
+    # Writes the aggregate and every per-page record, not just the slowest, as JSON.
+    json.dump({"aggregate": _stats.snapshot(), "pages": _stats.pages}, fp, indent=1)
@@ -0,0 +1,201 @@
+import json
+import os
+import posixpath
+import re
+
+from htmlnode import ParentNode
+
+LINK_INDEX_NAME = ".links.json"
+LINK_INDEX_VERSION = 1
+ROOT_PAGE = "index.html"
+
+_EXTERNAL_PATTERN = re.compile(r"[a-zA-Z][a-zA-Z0-9+.-]*:|//")
+
+
+def _reference(node):
+    if node.tag == "a" and node.props and "href" in node.props:
+        return "a", node.props["href"]
+    if node.tag == "img" and node.props and "src" in node.props:
+        return "img", node.props["src"]
+    return None
+
+
+def iter_references(node):
+    # Yields ("a", href) and ("img", src) for every link and image in a rendered tree.
+    # A link whose text has markup, e.g. [see **docs**](/docs), is a ParentNode.
+    # Children are walked with forward iterators, so lazy ones are built one at a time.
+    stack = [iter((node,))]
+    while stack:
+        for node in stack[-1]:
+            reference = _reference(node)
+            if reference is not None:
+                yield reference
+            if isinstance(node, ParentNode):
+                stack.append(iter(node.children))
+                break
+        else:
+            stack.pop()
+
+
+def reference_collector(references):
+    # Returns a visit function for HTMLNode.iter_html that appends each link and image to
+    # references while the page is written. Lazily parsed children, such as table rows,
+    # are then parsed once per page rather than once more by iter_references.
+    def visit(node):
+        reference = _reference(node)
+        if reference is not None:
+            references.append(reference)
+    return visit
+
+
+def resolve_url(page, url):
+    # Maps a URL found on page to a site-relative path, or None for external URLs
+    # and same-page anchors. Paths use "/" and have no leading slash.
+    if _EXTERNAL_PATTERN.match(url):
+        return None
+    path = url.split("#", 1)[0].split("?", 1)[0]
+    if not path:
+        return None
+    if not path.startswith("/"):
+        path = posixpath.join(posixpath.dirname(page), path)
+    trailing = path.endswith("/")
+    path = posixpath.normpath("/" + path).lstrip("/")
+    if trailing and path:
+        path += "/"
+    return path
+
+
+class LinkIndex:
+    # Outgoing links and images of every rendered page, keyed by its output path.
+    # The reverse map, used by every query, is built once and kept until a page changes.
+
+    def __init__(self):
+        self.pages = {}
+        self.files = set()
+        self.changed = False
+        self._incoming = None
+        self._broken = None
+
+    def __len__(self):
+        return len(self.pages)
+
+    def set_page(self, page, references):
+        links = []
+        images = []
+        for tag, url in references:
+            (images if tag == "img" else links).append(url)
+        entry = (links, images)
+        if self.pages.get(page) != entry:
+            self.pages[page] = entry
+            self._invalidate()
+
+    def remove_page(self, page):
+        if self.pages.pop(page, None) is not None:
+            self._invalidate()
+
+    def set_files(self, files):
+        # Non-page outputs, such as copied static files, that links may point at.
+        files = set(files)
+        if files != self.files:
+            self.files = files
+            self._invalidate()
+
+    def _invalidate(self):
+        self.changed = True
+        self._incoming = None
+        self._broken = None
+
+    def resolve(self, page, url):
+        # Returns the output a URL on page points at, "" if it points at nothing in
+        # the site, or None if it is external.
+        path = resolve_url(page, url)
+        if path is None:
+            return None
+        if path == "" or path.endswith("/"):
+            candidates = (path + ROOT_PAGE,)
+        else:
+            candidates = (path, path + ".html", path + "/" + ROOT_PAGE)
+        for candidate in candidates:
+            if candidate in self.pages or candidate in self.files:
+                return candidate
+        return ""
+
+    def _build(self):
+        incoming = {}
+        broken = []
+        for page, (links, images) in self.pages.items():
+            for url in links + images:
+                target = self.resolve(page, url)
+                if target is None:
+                    continue
+                if target == "":
+                    broken.append((page, url))
+                else:
+                    incoming.setdefault(target, set()).add(page)
+        self._incoming = incoming
+        self._broken = sorted(broken)
+
+    def links_to(self, url):
+        # "What links here": pages that link to or embed url, given from the site root.
+        if self._incoming is None:
+            self._build()
+        target = self.resolve(ROOT_PAGE, url)
+        return sorted(self._incoming.get(target, ())) if target else []
+
+    def broken(self):
+        # (page, url) pairs whose target is neither a page nor a copied file.
+        if self._broken is None:
+            self._build()
+        return self._broken
+
+    def orphans(self):
+        # Pages that no other page links to, apart from the site's root page.
+        if self._incoming is None:
+            self._build()
+        return sorted(
+            page for page in self.pages
+            if page != ROOT_PAGE and not self._incoming.get(page, set()) - {page}
+        )
+
+    def to_json(self):
+        # Every URL and path is stored once in a string table; pages refer to it by index.
+        strings = {}
+        def intern(value):
+            return strings.setdefault(value, len(strings))
+        pages = [
+            [intern(page), [intern(url) for url in links], [intern(url) for url in images]]
+            for page, (links, images) in sorted(self.pages.items())
+        ]
+        files = sorted(intern(path) for path in self.files)
+        return json.dumps(
+            {"version": LINK_INDEX_VERSION, "strings": list(strings), "pages": pages, "files": files},
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, text):
+        data = json.loads(text)
+        if data.get("version") != LINK_INDEX_VERSION:
+            raise ValueError("unsupported link index version")
+        strings = data["strings"]
+        index = cls()
+        for page, links, images in data["pages"]:
+            index.pages[strings[page]] = ([strings[i] for i in links], [strings[i] for i in images])
+        index.files = {strings[i] for i in data["files"]}
+        return index
+
+    @classmethod
+    def load(cls, dest_dir):
+        # Returns the index of the previous build, or an empty one if there is none.
+        try:
+            with open(os.path.join(dest_dir, LINK_INDEX_NAME), encoding="utf-8") as fp:
+                return cls.from_json(fp.read())
+        except (OSError, ValueError, KeyError, IndexError, TypeError):
+            return cls()
+
+    def save(self, dest_dir):
+        path = os.path.join(dest_dir, LINK_INDEX_NAME)
+        with open(path + ".tmp", "w", encoding="utf-8") as fp:
+            fp.write(self.to_json())
+        os.replace(path + ".tmp", path)
+        self.changed = False
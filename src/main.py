@@ -1,14 +1,84 @@
-from textnode import TextNode
+import argparse
+import asyncio
+import os
 
+import devserver
+import instrument
+from blockcache import BlockCache
+from build import build_site
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Build the static site from markdown content.")
+    parser.add_argument("--content", default="content", help="directory of markdown pages")
+    parser.add_argument("--static", default="public", help="directory of static assets to copy")
+    parser.add_argument("--template", default="template.html", help="HTML page template")
+    parser.add_argument("--dest", default="docs", help="output directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of page-rendering processes")
+    parser.add_argument("--clean", action="store_true",
+                        help="ignore the build manifest and rebuild every page")
+    parser.add_argument("--block-cache-mb", type=int, default=0,
+                        help="cache rendered blocks up to this many MB (0 disables the cache)")
+    parser.add_argument("--block-cache-file", default=None,
+                        help="persist the block cache in this file between builds")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"time each render stage and list the slowest pages (or set {instrument.ENV_VAR}=1)")
+    parser.add_argument("--profile-json", metavar="FILE", default=None,
+                        help="with profiling, also write the aggregate and every page's record to FILE as JSON")
+    parser.add_argument("--compress", action="store_true",
+                        help="write .gz (and .br, if brotli is installed) siblings of text outputs")
+    parser.add_argument("--check-links", action="store_true",
+                        help="list links to missing pages or files, and pages nothing links to")
+    parser.add_argument("--links-to", metavar="URL", default=None,
+                        help="list the pages that link to URL (from the site root, e.g. /blog/post)")
+    parser.add_argument("--serve", action="store_true",
+                        help="after building, serve the site and re-render pages as they change")
+    parser.add_argument("--port", type=int, default=8888, help="port for --serve")
+    args = parser.parse_args()
 
-    dummy = TextNode("This is some anchor text","LINK","https://www.boot.dev")
+    if args.profile or args.profile_json or instrument.enabled_from_env():
+        instrument.enable()
 
-    print(dummy)
+    cache = None
+    if args.block_cache_mb > 0:
+        cache = BlockCache(args.block_cache_mb * 1024 * 1024, args.block_cache_file)
+    result = build_site(args.content, args.static, args.template, args.dest, args.workers, args.clean, cache,
+                        args.compress)
+    kind = "clean" if args.clean else "incremental"
+    print(f"{kind} build into {args.dest}: rendered {len(result.rendered)}, skipped {result.skipped}, "
+          f"removed {len(result.removed)}, copied {result.copied} static files in {result.elapsed:.2f}s")
+    if result.compression is not None:
+        stats = result.compression
+        print(f"compression: wrote {stats.written} files, {stats.skipped} up to date, "
+              f"saved {stats.saved / 1_048_576:.1f} MB")
+    if cache is not None:
+        stats = cache.stats()
+        print(f"block cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.0%}), {stats['entries']} entries, {stats['bytes'] / 1_048_576:.1f} MB")
+    if instrument.is_enabled():
+        print(instrument.format_report())
+        if args.profile_json:
+            with open(args.profile_json, "w", encoding="utf-8") as fp:
+                instrument.dump(fp)
+    if args.check_links:
+        broken = result.links.broken()
+        orphans = result.links.orphans()
+        print(f"{len(broken)} broken links, {len(orphans)} orphan pages")
+        for page, url in broken:
+            print(f"  broken: {page} -> {url}")
+        for page in orphans:
+            print(f"  orphan: {page}")
+    if args.links_to is not None:
+        for page in result.links.links_to(args.links_to):
+            print(page)
+    if args.serve:
+        try:
+            asyncio.run(devserver.serve(args.content, args.static, args.template, args.dest,
+                                        port=args.port, workers=max(1, args.workers // 2)))
+        except KeyboardInterrupt:
+            pass
 
 
-
-main()
-
+if __name__ == "__main__":
+    main()
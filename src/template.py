@@ -0,0 +1,67 @@
+import functools
+import re
+
+from htmlnode import write_chunks
+
+_SLOT_PATTERN = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+
+
+class Template:
+    # A page template compiled into literal chunks and the slot names between them:
+    # literals[i] is followed by the value of slots[i], and literals has one more entry.
+    # Slots without a value are left in the output as written.
+    __slots__ = ("literals", "slots", "markers", "repeated")
+
+    def __init__(self, text):
+        self.literals = []
+        self.slots = []
+        self.markers = []
+        start = 0
+        for match in _SLOT_PATTERN.finditer(text):
+            self.literals.append(text[start:match.start()])
+            self.slots.append(match.group(1))
+            self.markers.append(match.group(0))
+            start = match.end()
+        self.literals.append(text[start:])
+        self.repeated = frozenset(name for name in self.slots if self.slots.count(name) > 1)
+
+    def iter_chunks(self, values):
+        # Yields the page in pieces. A value may be a string or an iterable of strings,
+        # such as HTMLNode.iter_html(); an iterable is only consumed once.
+        if self.repeated:
+            values = {
+                name: value if isinstance(value, str) or name not in self.repeated else "".join(value)
+                for name, value in values.items()
+            }
+        for literal, name, marker in zip(self.literals, self.slots, self.markers):
+            if literal:
+                yield literal
+            value = values.get(name)
+            if value is None:
+                yield marker
+            elif isinstance(value, str):
+                yield value
+            else:
+                yield from value
+        if self.literals[-1]:
+            yield self.literals[-1]
+
+    def render(self, values):
+        return "".join(self.iter_chunks(values))
+
+    def write(self, fp, values, buffer_size=65536):
+        # Streams the page to fp in writes of about buffer_size characters.
+        write_chunks(fp, self.iter_chunks(values), buffer_size)
+
+
+@functools.lru_cache(maxsize=16)
+def _compile(text):
+    return Template(text)
+
+
+def compile_template(template):
+    # Returns the compiled form of a template string; each distinct text is compiled
+    # once per process, so a build parses its template once rather than once per page.
+    if isinstance(template, Template):
+        return template
+    return _compile(template)
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+from blockcache import BlockCache
+from blocks import BlockType, markdown_to_html_node
+from htmlnode import LeafNode, ParentNode
+
+
+FOOTER = "Licensed under the **MIT** license, see [LICENSE](/license.html)."
+
+
+class TestBlockCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = BlockCache()
+        md = f"# Page one\n\n{FOOTER}\n\n> Note\n\n{FOOTER}"
+        first = markdown_to_html_node(md, cache)
+        self.assertEqual(first.to_html(), markdown_to_html_node(md).to_html())
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+        markdown_to_html_node(f"# Page two\n\n{FOOTER}", cache)
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+        self.assertEqual(cache.stats()["entries"], 4)
+
+    def test_key_includes_block_type(self):
+        cache = BlockCache()
+        cache.put("text", BlockType.PARAGRAPH, ParentNode("p", [LeafNode(None, "text")]))
+        self.assertIsNone(cache.get("text", BlockType.HEADING))
+        self.assertIsNotNone(cache.get("text", BlockType.PARAGRAPH))
+
+    def test_lazy_table_is_not_cached(self):
+        cache = BlockCache()
+        md = "| a |\n|---|\n| **b** |"
+        self.assertEqual(markdown_to_html_node(md, cache).to_html(), markdown_to_html_node(md).to_html())
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction_respects_budget(self):
+        node = ParentNode("p", [LeafNode(None, "x" * 100)])
+        cache = BlockCache(max_bytes=2000)
+        for i in range(10):
+            cache.put(f"block {i}", BlockType.PARAGRAPH, node)
+            cache.get("block 0", BlockType.PARAGRAPH)
+        self.assertLessEqual(cache.size, 2000)
+        self.assertLess(len(cache), 10)
+        self.assertIsNotNone(cache.get("block 0", BlockType.PARAGRAPH))
+        self.assertIsNone(cache.get("block 1", BlockType.PARAGRAPH))
+
+    def test_persistence_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "blocks.cache")
+            cache = BlockCache(path=path)
+            markdown_to_html_node(FOOTER, cache)
+            cache.save()
+            reloaded = BlockCache(path=path)
+            self.assertEqual(len(reloaded), 1)
+            node = markdown_to_html_node(FOOTER, reloaded)
+            self.assertEqual((reloaded.hits, reloaded.misses), (1, 0))
+            self.assertEqual(node.to_html(), markdown_to_html_node(FOOTER).to_html())
+
+    def test_corrupt_file_is_ignored(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "blocks.cache")
+            with open(path, "wb") as fp:
+                fp.write(b"not a cache")
+            self.assertEqual(len(BlockCache(path=path)), 0)
+
+    def test_unloadable_file_is_ignored(self):
+        # A class that no longer exists, and a module that no longer exists.
+        for payload in (b"cblockcache\nNoSuchNode\n.", b"cno_such_module\nNode\n."):
+            with self.subTest(payload), tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "blocks.cache")
+                with open(path, "wb") as fp:
+                    fp.write(payload)
+                self.assertEqual(len(BlockCache(path=path)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,10 @@
+from enum import Enum
 from textwrap import dedent
+import io
 import unittest
-from blocks import markdown_to_blocks, block_to_block_type, BlockType, markdown_to_html_node
+from blocks import markdown_to_blocks, iter_blocks, block_to_block_type, BlockType, markdown_to_html_node
+from blocks import block_to_html_node, register_block_type, unregister_block_type
+from htmlnode import LeafNode, ParentNode
 
 
 class TestMarkdowntoBlock(unittest.TestCase):
@@ -31,6 +35,19 @@ This is the same paragraph on a new line
             blocks = markdown_to_blocks(md)
             self.assertEqual(blocks, [])
 
+        def test_iter_blocks_from_file(self):
+            md = io.StringIO("# Title\n\n\nFirst line\nsecond line\n\n- item\n")
+            blocks = iter_blocks(md)
+            self.assertEqual(next(blocks), "# Title")
+            self.assertEqual(list(blocks), ["First line\nsecond line", "- item"])
+
+        def test_iter_blocks_keeps_fenced_code_together(self):
+            lines = ["Intro", "", "```", "first", "", "", "second", "```", "", "Outro"]
+            self.assertEqual(
+                list(iter_blocks(lines)),
+                ["Intro", "```\nfirst\n\n\nsecond\n```", "Outro"],
+            )
+
         def test_block_to_block_type(self):
             self.assertEqual(block_to_block_type("# Heading 1"), BlockType.HEADING)
             self.assertEqual(
@@ -58,6 +75,22 @@ This is the same paragraph on a new line
             md = "1. Only item"
             self.assertEqual(block_to_block_type(md), BlockType.ORDERED_LIST)
 
+        def test_block_to_block_type_long_ordered_list(self):
+            md = "\n".join(f"{i}. item {i}" for i in range(1, 13))
+            self.assertEqual(block_to_block_type(md), BlockType.ORDERED_LIST)
+
+        def test_block_to_block_type_ordered_list_leading_zero(self):
+            self.assertEqual(block_to_block_type("1. one\n02. two"), BlockType.PARAGRAPH)
+
+        def test_block_to_block_type_every_line_validated(self):
+            self.assertEqual(block_to_block_type("> quote\nnot a quote"), BlockType.PARAGRAPH)
+            self.assertEqual(block_to_block_type("- item\nnot an item"), BlockType.PARAGRAPH)
+            self.assertEqual(block_to_block_type("- item\n-not an item"), BlockType.PARAGRAPH)
+            self.assertEqual(block_to_block_type(">one\n>two"), BlockType.QUOTE)
+
+        def test_block_to_block_type_empty(self):
+            self.assertEqual(block_to_block_type(""), BlockType.PARAGRAPH)
+
 class TestMarkdownToHtmlNodes(unittest.TestCase):
     from blocks import markdown_to_html_node
     from htmlnode import HTMLNode, LeafNode, ParentNode
@@ -79,6 +112,14 @@ class TestMarkdownToHtmlNodes(unittest.TestCase):
             "<div><p>This is <b>bolded</b> paragraph text in a p tag here</p><p>This is another paragraph with <i>italic</i> text and <code>code</code> here</p></div>",
         )
 
+    def test_inline_runs_become_fragments(self):
+        from blocks import text_to_children
+        children = text_to_children("Some **bold** and a [link](/x) & more")
+        self.assertEqual([type(child).__name__ for child in children], ["RawNode", "LeafNode", "RawNode"])
+        self.assertEqual(children[0].value, "Some <b>bold</b> and a ")
+        self.assertEqual(children[1].props, {"href": "/x"})
+        self.assertEqual(children[2].value, " &amp; more")
+
     def test_codeblock(self):
         md = """
 ```
@@ -94,6 +135,74 @@ the **same** even with inline stuff
             "<div><pre><code>This is text that _should_ remain\nthe **same** even with inline stuff\n</code></pre></div>",
         )
 
+    def test_html_node_from_stream(self):
+        md = io.StringIO("```\nline one\n\nline three\n```\n\nAfter the **code**\n")
+        node = markdown_to_html_node(md)
+        self.assertEqual(
+            node.to_html(),
+            "<div><pre><code>line one\n\nline three\n</code></pre><p>After the <b>code</b></p></div>",
+        )
+
+    def test_workers_output_is_identical(self):
+        import blocks
+        from unittest import mock
+        md = "\n\n".join(
+            f"## Section {i}\n\nText with **bold** and [link](/{i}).\n\n- a\n- b\n\n1. one\n2. two"
+            for i in range(200)
+        )
+        with mock.patch.object(blocks, "PARALLEL_CHUNK_CHARS", 500):
+            parallel = markdown_to_html_node(md, workers=2).to_html()
+        self.assertEqual(parallel, markdown_to_html_node(md).to_html())
+
+    def test_workers_reject_cache(self):
+        from blockcache import BlockCache
+        with self.assertRaises(ValueError):
+            markdown_to_html_node("text", cache=BlockCache(), workers=2)
+
+    def test_code_and_text_are_escaped_once(self):
+        import blocks
+        from unittest import mock
+        md = "Use a < b && **c**\n\n```\nif a < b && c:\n```"
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            "<div><p>Use a &lt; b &amp;&amp; <b>c</b></p>"
+            "<pre><code>if a &lt; b &amp;&amp; c:\n</code></pre></div>",
+        )
+        with mock.patch.object(blocks, "PARALLEL_CHUNK_CHARS", 10):
+            self.assertEqual(markdown_to_html_node(md, workers=2).to_html(), markdown_to_html_node(md).to_html())
+
+    def test_render_many_matches_markdown_to_html_node(self):
+        from blocks import render_many
+        snippets = ["Nice **post**", "", "  ", "- a\n- b", "# Hi\n\n> quoted `code`", "```\nx\n```", "Nice **post**"]
+        expected = [markdown_to_html_node(md).to_html() for md in snippets]
+        self.assertEqual(list(render_many(snippets)), expected)
+        self.assertEqual(list(render_many(iter(snippets), dedupe=True)), expected)
+
+    def test_render_many_dedupe_reuses_html(self):
+        from blocks import render_many
+        first, second = render_many(["same **text**", "same **text**"], dedupe=True)
+        self.assertIs(first, second)
+
+    def test_bytes_blocks_match_str(self):
+        md = "# Title\n\n  \n```\ncode\n\nmore\n```\nafter\n\n- é\n- ü\n\n\n> end\n"
+        self.assertEqual(list(iter_blocks(md.encode())), list(iter_blocks(md)))
+
+    def test_map_markdown(self):
+        import os
+        import tempfile
+        from blocks import map_markdown
+        md = "Some **bold** text\n\n```\nx = 1\n\ny = 2\n```\n"
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.md")
+            with open(path, "w", encoding="utf-8") as fp:
+                fp.write(md)
+            with map_markdown(path) as buffer:
+                html = markdown_to_html_node(buffer).to_html()
+            self.assertEqual(html, markdown_to_html_node(md).to_html())
+            open(path, "w").close()
+            with map_markdown(path) as buffer:
+                self.assertEqual(markdown_to_html_node(buffer).to_html(), "<div></div>")
+
     def test_multiple_paragraphs_with_inline(self):
         md = """
 This paragraph has **bold** and *italic* and `code`.
@@ -151,7 +260,83 @@ Final paragraph with ![image](https://example.com/img.png) alt text.
         html = node.to_html()
         self.assertIn("<blockquote>", html)
         self.assertIn("<b>bold</b>", html)
-                            
+
+
+class PluginType(Enum):
+    RULE = "rule"
+    NOTE = "note"
+
+
+class TestBlockPlugins(unittest.TestCase):
+    def tearDown(self):
+        for block_type in PluginType:
+            unregister_block_type(block_type)
+
+    def test_shared_first_character(self):
+        # "-" already belongs to unordered lists; the rule is tried when the list check fails.
+        register_block_type(PluginType.RULE, "-", lambda block: block == "---", lambda block: LeafNode("hr", ""))
+        self.assertEqual(block_to_block_type("---"), PluginType.RULE)
+        self.assertEqual(block_to_block_type("- item"), BlockType.UNORDERED_LIST)
+        self.assertEqual(markdown_to_html_node("one\n\n---\n\n- two").to_html(),
+                         "<div><p>one</p><hr></hr><ul><li>two</li></ul></div>")
+
+    def test_custom_block(self):
+        register_block_type(PluginType.NOTE, "!", lambda block: block.startswith("!!! "),
+                            lambda block: ParentNode("aside", [LeafNode(None, block[4:])]))
+        self.assertEqual(markdown_to_html_node("!!! careful").to_html(), "<div><aside>careful</aside></div>")
+        self.assertEqual(block_to_block_type("!! not a note"), BlockType.PARAGRAPH)
+        unregister_block_type(PluginType.NOTE)
+        self.assertEqual(block_to_block_type("!!! careful"), BlockType.PARAGRAPH)
+        with self.assertRaises(ValueError):
+            block_to_html_node("!!! careful", PluginType.NOTE)
+
+    def test_reregistering_replaces(self):
+        register_block_type(PluginType.NOTE, "!", lambda block: True, lambda block: LeafNode("p", "first"))
+        register_block_type(PluginType.NOTE, "?", lambda block: True, lambda block: LeafNode("p", "second"))
+        self.assertEqual(block_to_block_type("!x"), BlockType.PARAGRAPH)
+        self.assertEqual(markdown_to_html_node("?x").to_html(), "<div><p>second</p></div>")
+
+
+class TestTables(unittest.TestCase):
+    TABLE = dedent(r"""
+        | Name | Type | Notes |
+        |:-----|-----:|:-----:|
+        | **id** | `int` | a \| b |
+        | [docs](/docs) | |
+        | x | y | z | extra
+        """)
+
+    def test_block_type(self):
+        self.assertEqual(block_to_block_type(self.TABLE.strip()), BlockType.TABLE)
+        self.assertEqual(block_to_block_type("| a |\n| b |"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("| a | b |\n|---|"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("| just a pipe"), BlockType.PARAGRAPH)
+
+    def test_table(self):
+        self.assertEqual(
+            markdown_to_html_node(self.TABLE).to_html(),
+            '<div><table><thead><tr><th align="left">Name</th><th align="right">Type</th>'
+            '<th align="center">Notes</th></tr></thead><tbody>'
+            '<tr><td align="left"><b>id</b></td><td align="right"><code>int</code></td>'
+            '<td align="center">a | b</td></tr>'
+            '<tr><td align="left"><a href="/docs">docs</a></td><td align="right"></td><td align="center"></td></tr>'
+            '<tr><td align="left">x</td><td align="right">y</td><td align="center">z</td></tr>'
+            '</tbody></table></div>',
+        )
+
+    def test_header_only(self):
+        self.assertEqual(markdown_to_html_node("a | b\n--|--").to_html(), "<div><p>a | b --|--</p></div>")
+        self.assertEqual(markdown_to_html_node("| a | b |\n|---|---|").to_html(),
+                         "<div><table><thead><tr><th>a</th><th>b</th></tr></thead></table></div>")
+
+    def test_rows_are_streamed(self):
+        from linkindex import iter_references
+        table = markdown_to_html_node("| page |\n|---|\n" + "\n".join(f"| [p{i}](/p{i}) |" for i in range(100)))
+        rows = table.children[0].children[1].children
+        self.assertNotIsInstance(rows, list)
+        self.assertEqual(table.to_html(), table.to_html())
+        self.assertEqual([url for _, url in iter_references(table)], [f"/p{i}" for i in range(100)])
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
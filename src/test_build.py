@@ -0,0 +1,212 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+import instrument
+from blockcache import BlockCache
+from build import build_site, extract_title, find_pages
+
+
+TEMPLATE = "<title>{{ Title }}</title><main>{{ Content }}</main>"
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write(text)
+
+
+def read(path):
+    with open(path, encoding="utf-8") as fp:
+        return fp.read()
+
+
+class TestExtractTitle(unittest.TestCase):
+    def test_first_h1(self):
+        self.assertEqual(extract_title(["intro\n", "## Sub\n", "# Title \n", "# Other\n"]), "Title")
+
+    def test_no_h1(self):
+        self.assertIsNone(extract_title(["just text\n"]))
+
+
+class TestBuildSite(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.static = os.path.join(root, "static")
+        self.template = os.path.join(root, "template.html")
+        self.dest = os.path.join(root, "site")
+        write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome **home**\n")
+        write(os.path.join(self.content, "blog", "post.md"), "# Post\n\n- one\n- two\n")
+        write(os.path.join(self.content, "notes.md"), "No title here\n")
+        write(os.path.join(self.static, "styles.css"), "body {}\n")
+        write(os.path.join(self.static, "images", "logo.png"), "png")
+        write(os.path.join(self.static, ".styles.css.swp"), "swap")
+        write(self.template, TEMPLATE)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_find_pages(self):
+        pages = find_pages(self.content)
+        self.assertEqual(
+            pages,
+            [
+                ("index.md", "index.html"),
+                ("notes.md", "notes.html"),
+                (os.path.join("blog", "post.md"), os.path.join("blog", "post.html")),
+            ],
+        )
+
+    def check_site(self):
+        self.assertEqual(
+            read(os.path.join(self.dest, "index.html")),
+            "<title>Home</title><main><div><h1>Home</h1><p>Welcome <b>home</b></p></div></main>",
+        )
+        self.assertEqual(
+            read(os.path.join(self.dest, "blog", "post.html")),
+            "<title>Post</title><main><div><h1>Post</h1><ul><li>one</li><li>two</li></ul></div></main>",
+        )
+        self.assertIn("<title>notes</title>", read(os.path.join(self.dest, "notes.html")))
+        self.assertEqual(read(os.path.join(self.dest, "images", "logo.png")), "png")
+        self.assertFalse(os.path.exists(os.path.join(self.dest, ".styles.css.swp")))
+
+    def test_parallel_build_with_fresh_cache(self):
+        # An empty BlockCache is falsy (it has __len__); workers must still get a cache.
+        for i in range(4):
+            write(os.path.join(self.content, f"page{i}.md"), f"# Page {i}\n\nShared **footer**\n")
+        cache = BlockCache(8 * 1024 * 1024)
+        result = build_site(self.content, self.static, self.template, self.dest, workers=2, cache=cache)
+        self.assertEqual(len(result.rendered), 7)
+        self.assertEqual(cache.hits + cache.misses, 13)
+        self.assertGreater(cache.misses, 0)
+
+    def test_title_is_escaped(self):
+        write(os.path.join(self.content, "index.md"), '# A <b> & "c"\n')
+        build_site(self.content, self.static, self.template, self.dest)
+        self.assertEqual(
+            read(os.path.join(self.dest, "index.html")),
+            '<title>A &lt;b&gt; &amp; "c"</title><main><div><h1>A &lt;b&gt; &amp; "c"</h1></div></main>',
+        )
+
+    def test_build_serial(self):
+        result = build_site(self.content, self.static, self.template, self.dest, workers=1)
+        self.assertEqual(len(result.rendered), 3)
+        self.check_site()
+
+    def test_build_parallel(self):
+        result = build_site(self.content, self.static, self.template, self.dest, workers=2)
+        self.assertEqual(len(result.rendered), 3)
+        self.check_site()
+
+    def test_noop_rebuild_skips_everything(self):
+        build_site(self.content, self.static, self.template, self.dest)
+        result = build_site(self.content, self.static, self.template, self.dest)
+        self.assertEqual(result.rendered, [])
+        self.assertEqual(result.skipped, 3)
+        self.assertEqual(result.copied, 0)
+        self.check_site()
+
+    def test_rebuild_only_changed_page(self):
+        build_site(self.content, self.static, self.template, self.dest)
+        write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome back\n")
+        result = build_site(self.content, self.static, self.template, self.dest)
+        self.assertEqual(result.rendered, [os.path.join(self.dest, "index.html")])
+        self.assertEqual(result.skipped, 2)
+        self.assertIn("<p>Welcome back</p>", read(os.path.join(self.dest, "index.html")))
+
+    def test_touched_but_unchanged_page_is_skipped(self):
+        build_site(self.content, self.static, self.template, self.dest)
+        path = os.path.join(self.content, "notes.md")
+        os.utime(path, ns=(0, 0))
+        result = build_site(self.content, self.static, self.template, self.dest)
+        self.assertEqual(result.rendered, [])
+
+    def test_template_change_rebuilds_all(self):
+        build_site(self.content, self.static, self.template, self.dest)
+        write(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        result = build_site(self.content, self.static, self.template, self.dest)
+        self.assertEqual(len(result.rendered), 3)
+        self.assertTrue(read(os.path.join(self.dest, "index.html")).startswith("<h1>Home</h1>"))
+
+    def test_deleted_sources_are_removed(self):
+        build_site(self.content, self.static, self.template, self.dest)
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        os.remove(os.path.join(self.static, "styles.css"))
+        result = build_site(self.content, self.static, self.template, self.dest)
+        self.assertEqual(sorted(result.removed), [os.path.join("blog", "post.html"), "styles.css"])
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog", "post.html")))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "styles.css")))
+
+    def test_page_wins_over_static_file(self):
+        write(os.path.join(self.static, "index.html"), "static")
+        build_site(self.content, self.static, self.template, self.dest)
+        build_site(self.content, self.static, self.template, self.dest)
+        self.assertIn("<h1>Home</h1>", read(os.path.join(self.dest, "index.html")))
+
+    def test_link_index_follows_incremental_builds(self):
+        write(os.path.join(self.content, "index.md"), "# Home\n\n[Post](/blog/post) ![logo](images/logo.png)\n")
+        write(os.path.join(self.content, "blog", "post.md"), "# Post\n\n[home](../index.html) [gone](/gone)\n")
+        links = build_site(self.content, self.static, self.template, self.dest).links
+        self.assertEqual(links.links_to("/blog/post"), ["index.html"])
+        self.assertEqual(links.links_to("/images/logo.png"), ["index.html"])
+        self.assertEqual(links.broken(), [("blog/post.html", "/gone")])
+        self.assertEqual(links.orphans(), ["notes.html"])
+
+        write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nNo links\n")
+        links = build_site(self.content, self.static, self.template, self.dest).links
+        self.assertEqual(links.broken(), [])
+        self.assertEqual(links.links_to("/"), [])
+        self.assertEqual(links.links_to("/blog/post"), ["index.html"])
+
+    def test_table_cells_are_parsed_once(self):
+        rows = "\n".join(f"| [page {i}](/p{i}) | **{i}** |" for i in range(50))
+        write(os.path.join(self.content, "table.md"), "# Table\n\n| Page | Number |\n|---|--:|\n" + rows + "\n")
+        instrument.enable()
+        self.addCleanup(instrument.disable)
+        links = build_site(self.content, self.static, self.template, self.dest).links
+        record = next(page for page in instrument.stats().pages if page["path"].endswith("table.md"))
+        # One call for the heading, two for the header row and two per body row.
+        self.assertEqual(record["calls"]["text_to_textnodes"], 1 + 2 + 2 * 50)
+        self.assertIn(("table.html", "/p49"), links.broken())
+        self.assertIn('<td align="right"><b>49</b></td>', read(os.path.join(self.dest, "table.html")))
+
+    def test_compress(self):
+        write(os.path.join(self.content, "blog", "post.md"), "# Post\n\n" + "Some words. " * 100)
+        result = build_site(self.content, self.static, self.template, self.dest, compress=True)
+        sibling = os.path.join(self.dest, "blog", "post.html.gz")
+        self.assertTrue(os.path.exists(sibling))
+        self.assertGreater(result.compression.saved, 0)
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        build_site(self.content, self.static, self.template, self.dest, compress=True)
+        self.assertFalse(os.path.exists(sibling))
+
+    def test_rebuild_without_compress_removes_stale_siblings(self):
+        write(os.path.join(self.content, "blog", "post.md"), "# Post\n\n" + "Some words. " * 100)
+        write(os.path.join(self.static, "styles.css"), "body { color: red; }\n" * 50)
+        build_site(self.content, self.static, self.template, self.dest, compress=True)
+        page = os.path.join(self.dest, "blog", "post.html.gz")
+        static = os.path.join(self.dest, "styles.css.gz")
+        self.assertTrue(os.path.exists(page) and os.path.exists(static))
+        write(os.path.join(self.content, "blog", "post.md"), "# Post\n\n" + "Other words. " * 100)
+        write(os.path.join(self.static, "styles.css"), "body { color: blue; }\n" * 50)
+        build_site(self.content, self.static, self.template, self.dest)
+        self.assertFalse(os.path.exists(page))
+        self.assertFalse(os.path.exists(static))
+
+    def test_compressed_rebuild_replaces_sibling_of_older_static_file(self):
+        css = os.path.join(self.static, "styles.css")
+        write(css, "body { color: red; }\n" * 50)
+        build_site(self.content, self.static, self.template, self.dest, compress=True)
+        # copy2 keeps the source mtime, so the new copy is older than the existing .gz.
+        write(css, "body { color: purple; }\n" * 50)
+        os.utime(css, ns=(1_000_000_000, 1_000_000_000))
+        build_site(self.content, self.static, self.template, self.dest, compress=True)
+        with gzip.open(os.path.join(self.dest, "styles.css.gz"), "rt") as fp:
+            self.assertIn("purple", fp.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
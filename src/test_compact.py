@@ -0,0 +1,97 @@
+import io
+import unittest
+
+from blocks import markdown_to_html_node
+from compact import CompactDocument, NO_PROPS
+from htmlnode import LeafNode, ParentNode, RawNode
+
+
+MARKDOWN = """
+# Title with `code`
+
+A paragraph with **bold**, _italic_ and a [link](https://www.boot.dev).
+
+- one ![icon](/icon.png)
+- two
+
+1. first
+2. second
+
+> quoted **text**
+
+```
+raw _code_ <tag> & more
+```
+"""
+
+
+class TestCompactDocument(unittest.TestCase):
+    def test_same_html_as_tree(self):
+        document = markdown_to_html_node(MARKDOWN, compact=True)
+        self.assertIsInstance(document, CompactDocument)
+        self.assertEqual(document.to_html(), markdown_to_html_node(MARKDOWN).to_html())
+
+    def test_write_html(self):
+        document = markdown_to_html_node(MARKDOWN, compact=True)
+        out = io.StringIO()
+        document.write_html(out, buffer_size=8)
+        self.assertEqual(out.getvalue(), document.to_html())
+
+    def test_round_trip_to_html_node(self):
+        document = markdown_to_html_node(MARKDOWN, compact=True)
+        node = document.to_html_node()
+        self.assertIsInstance(node, ParentNode)
+        self.assertEqual(node.to_html(), markdown_to_html_node(MARKDOWN).to_html())
+
+    def test_raw_leaves(self):
+        document = CompactDocument()
+        document.append(ParentNode("p", [LeafNode(None, "<b>"), RawNode(None, "<br>")]))
+        self.assertEqual(list(document.raw_leaves), [0, 1])
+        self.assertEqual(document.to_html(), "<p>&lt;b&gt;<br></p>")
+        self.assertIsInstance(document.to_html_node().children[1], RawNode)
+
+    def test_arrays(self):
+        document = CompactDocument()
+        document.append(ParentNode("p", [
+            LeafNode(None, "see "),
+            LeafNode("a", "docs", {"href": "/docs"}),
+        ]))
+        self.assertEqual(len(document), 3)
+        self.assertEqual([document.tag_names[t] for t in document.tags], ["p", None, "a"])
+        self.assertEqual(list(document.ends), [3, 2, 3])
+        self.assertEqual(list(document.leaf_ids), [-1, 0, 1])
+        self.assertEqual(list(document.prop_ids), [NO_PROPS, NO_PROPS, 0])
+        self.assertEqual(document.text, "see docs")
+        self.assertEqual(list(document.text_offsets), [0, 4, 8])
+        self.assertEqual(document.to_html(), '<p>see <a href="/docs">docs</a></p>')
+
+    def test_empty_parent(self):
+        document = CompactDocument()
+        document.append(ParentNode("div", [ParentNode("ul", []), LeafNode("b", "x")]))
+        self.assertEqual(document.to_html(), "<div><ul></ul><b>x</b></div>")
+
+    def test_lazy_children(self):
+        # Table rows are an iterable, not a sequence; they are walked forwards, one at a time.
+        table = markdown_to_html_node("| n |\n|---|\n" + "\n".join(f"| {i} |" for i in range(50)))
+        document = CompactDocument()
+        document.append(table)
+        self.assertEqual(document.to_html(), table.to_html())
+        rows = (ParentNode("li", [LeafNode(None, str(i))]) for i in range(3))
+        document = CompactDocument()
+        document.append(ParentNode("ul", rows))
+        self.assertEqual(document.to_html(), "<ul><li>0</li><li>1</li><li>2</li></ul>")
+
+    def test_errors(self):
+        document = CompactDocument()
+        with self.assertRaises(ValueError):
+            document.append(LeafNode("p", None))
+        with self.assertRaises(ValueError):
+            document.append(ParentNode("p", None))
+        document = CompactDocument()
+        document.open("div")
+        with self.assertRaises(ValueError):
+            document.to_html()
+
+
+if __name__ == "__main__":
+    unittest.main()
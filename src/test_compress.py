@@ -0,0 +1,61 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from compress import Compressor
+
+
+class TestCompressor(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.page = os.path.join(self.tmp.name, "page.html")
+        self.write(self.page, "<p>repeated text</p>" * 200)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        with open(path, "w", encoding="utf-8") as fp:
+            fp.write(text)
+
+    def compress(self, *paths):
+        with Compressor(formats=["gzip"], workers=2) as compressor:
+            for path in paths:
+                compressor.submit(path)
+        return compressor.stats
+
+    def test_writes_gzip_sibling(self):
+        stats = self.compress(self.page)
+        with gzip.open(self.page + ".gz", "rt", encoding="utf-8") as fp:
+            self.assertEqual(fp.read(), "<p>repeated text</p>" * 200)
+        self.assertEqual(stats.written, 1)
+        self.assertEqual(stats.original_bytes, 4000)
+        self.assertGreater(stats.saved, 3000)
+
+    def test_skips_newer_sibling(self):
+        self.compress(self.page)
+        self.assertEqual(self.compress(self.page).skipped, 1)
+        self.write(self.page, "<p>changed</p>" * 200)
+        os.utime(self.page, ns=(os.stat(self.page + ".gz").st_mtime_ns + 10**9,) * 2)
+        self.assertEqual(self.compress(self.page).written, 1)
+        with gzip.open(self.page + ".gz", "rt", encoding="utf-8") as fp:
+            self.assertEqual(fp.read(), "<p>changed</p>" * 200)
+
+    def test_small_and_binary_files(self):
+        self.compress(self.page)
+        self.write(self.page, "<p>tiny</p>")
+        image = os.path.join(self.tmp.name, "logo.png")
+        self.write(image, "x" * 1000)
+        stats = self.compress(self.page, image)
+        self.assertEqual(stats.written, 0)
+        self.assertFalse(os.path.exists(self.page + ".gz"))
+        self.assertFalse(os.path.exists(image + ".gz"))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            Compressor(formats=["zip"])
+
+
+if __name__ == "__main__":
+    unittest.main()
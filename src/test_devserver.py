@@ -0,0 +1,98 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from devserver import DevServer, EVENTS_PATH, RELOAD_SCRIPT, changed_paths, inject_reload_script, snapshot
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write(text)
+
+
+class TestHelpers(unittest.TestCase):
+    def test_inject_reload_script(self):
+        self.assertEqual(
+            inject_reload_script(b"<html><body><p>x</p></body></html>"),
+            b"<html><body><p>x</p>" + RELOAD_SCRIPT + b"</body></html>",
+        )
+        self.assertEqual(inject_reload_script(b"<p>x</p>"), b"<p>x</p>" + RELOAD_SCRIPT)
+
+    def test_snapshot_and_changed_paths(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            page = os.path.join(tmp, "a.md")
+            write(page, "one")
+            write(os.path.join(tmp, ".a.md.swp"), "swap")
+            before = snapshot(tmp)
+            self.assertEqual(list(before), [page])
+            write(page, "one two")
+            write(os.path.join(tmp, "sub", "b.md"), "new")
+            self.assertEqual(changed_paths(before, snapshot(tmp)), {page, os.path.join(tmp, "sub", "b.md")})
+
+
+class TestDevServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.page = os.path.join(self.content, "index.md")
+        write(self.page, "# Home\n\nFirst version\n")
+        write(os.path.join(root, "static", "styles.css"), "body {}")
+        write(os.path.join(root, "template.html"), "<html><body>{{ Content }}</body></html>")
+        self.server = DevServer(self.content, os.path.join(root, "static"), os.path.join(root, "template.html"),
+                                os.path.join(root, "site"), debounce=0.1, poll_interval=0.05)
+        self.host, self.port = await self.server.start(port=0)
+
+    async def asyncTearDown(self):
+        await self.server.close()
+        self.tmp.cleanup()
+
+    async def get(self, path):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        response = await reader.read()
+        writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        return head.split(b"\r\n")[0], body
+
+    async def test_serves_pages_and_assets(self):
+        status, body = await self.get("/")
+        self.assertEqual(status, b"HTTP/1.1 200 OK")
+        self.assertIn(b"<p>First version</p>", body)
+        self.assertIn(RELOAD_SCRIPT, body)
+        status, body = await self.get("/styles.css")
+        self.assertEqual(body, b"body {}")
+        status, _ = await self.get("/missing.html")
+        self.assertEqual(status, b"HTTP/1.1 404 Not Found")
+        status, _ = await self.get("/../template.html")
+        self.assertEqual(status, b"HTTP/1.1 404 Not Found")
+        status, _ = await self.get("/%00")
+        self.assertEqual(status, b"HTTP/1.1 404 Not Found")
+
+    async def test_change_rerenders_and_pushes_reload(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.write(f"GET {EVENTS_PATH} HTTP/1.1\r\n\r\n".encode())
+        await reader.readuntil(b"\r\n\r\n")
+        for n in range(3):
+            write(self.page, f"# Home\n\nSave number {n}\n")
+            await asyncio.sleep(0.02)
+        event = await asyncio.wait_for(reader.readuntil(b"\n\n"), 10)
+        self.assertTrue(event.startswith(b"event: reload\n"))
+        self.assertEqual(self.server.rebuilds, 1)
+        _, body = await self.get("/index.html")
+        self.assertIn(b"<p>Save number 2</p>", body)
+        writer.close()
+
+    async def test_markdown_in_static_is_copied_not_rendered(self):
+        static_page = os.path.join(self.tmp.name, "static", "README.md")
+        write(static_page, "# Read me\n")
+        await self.server.rebuild({static_page})
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, "static", "README.html")))
+        _, body = await self.get("/README.md")
+        self.assertEqual(body, b"# Read me\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
+import io
 import unittest
 
-from htmlnode import HTMLNode,LeafNode,ParentNode,text_node_to_html_node
+import htmlnode
+from htmlnode import HTMLNode,LeafNode,ParentNode,RawNode,register_inline_type,text_node_to_html_node,text_nodes_to_html
 from textnode import TextNode,TextType
 
 
@@ -31,6 +33,17 @@ class TestHTMLNode(unittest.TestCase):
         self.assertIn("hello", text)
         self.assertIn("class", text)
 
+    def test_nodes_are_slotted(self):
+        for node in (HTMLNode("p"), LeafNode("b", "x"), ParentNode("p", [])):
+            self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_value_and_children_are_not_aliased(self):
+        leaf = LeafNode("b", "bold")
+        parent = ParentNode("p", [leaf])
+        self.assertIsNone(leaf.children)
+        self.assertIsNone(parent.value)
+        self.assertEqual(parent.children, [leaf])
+
 class TestLeafNode(unittest.TestCase):
     def test_leaf_to_html_p(self):
         node = LeafNode("p", "Hello, world!")
@@ -60,6 +73,20 @@ class TestLeafNode(unittest.TestCase):
         with self.assertRaises(ValueError):
             node.to_html()
 
+    def test_leaf_escapes_text(self):
+        self.assertEqual(LeafNode(None, "a < b & c > d").to_html(), "a &lt; b &amp; c &gt; d")
+        self.assertEqual(LeafNode("b", "<script>").to_html(), "<b>&lt;script&gt;</b>")
+
+    def test_props_escape_quotes(self):
+        node = LeafNode("a", "x", {"href": '/?a=1&b="2"'})
+        self.assertEqual(node.to_html(), '<a href="/?a=1&amp;b=&quot;2&quot;">x</a>')
+
+    def test_raw_node_is_not_escaped(self):
+        self.assertEqual(RawNode(None, "<br>&amp;").to_html(), "<br>&amp;")
+        self.assertEqual(RawNode("span", "<i>x</i>").to_html(), "<span><i>x</i></span>")
+        with self.assertRaises(ValueError):
+            RawNode(None, None).to_html()
+
     def test_leaf_repr(self):
         node = LeafNode("p", "Hello", {"class": "greeting"})
         rep = repr(node)
@@ -128,6 +155,49 @@ class TestParentNode(unittest.TestCase):
         with self.assertRaises(ValueError):
             parent.to_html()
 
+    def test_iter_html_chunks_join_to_html(self):
+        parent = ParentNode("p", [LeafNode("b", "Bold"), LeafNode(None, " text")])
+        self.assertEqual(
+            list(parent.iter_html()),
+            ["<p>", "<b>Bold</b>", " text", "</p>"],
+        )
+
+    def test_write_html(self):
+        inner = ParentNode("li", [LeafNode(None, "item")])
+        outer = ParentNode("ul", [inner, inner], props={"class": "list"})
+        out = io.StringIO()
+        outer.write_html(out, buffer_size=4)
+        self.assertEqual(out.getvalue(), outer.to_html())
+        self.assertEqual(out.getvalue(), '<ul class="list"><li>item</li><li>item</li></ul>')
+
+    def test_deep_nesting_does_not_recurse(self):
+        node = LeafNode(None, "deep")
+        for _ in range(5000):
+            node = ParentNode("blockquote", [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<blockquote>" * 5000 + "deep"))
+        self.assertTrue(html.endswith("</blockquote>" * 5000))
+
+    def test_nested_no_children_raises(self):
+        parent = ParentNode("div", [ParentNode("span", None)])
+        with self.assertRaises(ValueError):
+            parent.to_html()
+
+    def test_generic_child_raises_not_implemented(self):
+        node = ParentNode("div", [HTMLNode("span", "x")])
+        with self.assertRaises(NotImplementedError):
+            node.to_html()
+        with self.assertRaises(NotImplementedError):
+            list(node.iter_html(lambda node: None))
+
+    def test_props_cache_keeps_value_types_apart(self):
+        self.assertEqual(LeafNode("td", "x", {"colspan": 1}).to_html(), '<td colspan="1">x</td>')
+        self.assertEqual(LeafNode("td", "x", {"colspan": True}).to_html(), '<td colspan="True">x</td>')
+        self.assertEqual(LeafNode("td", "x", {"colspan": 1.0}).to_html(), '<td colspan="1.0">x</td>')
+        self.assertEqual(LeafNode("td", "x", {"colspan": "1"}).to_html(), '<td colspan="1">x</td>')
+        self.assertEqual(LeafNode("td", "x", {"colspan": True}).to_html(), '<td colspan="True">x</td>')
+
+
 class TestNodetoHTML(unittest.TestCase):
 
     def test_text(self):
@@ -174,11 +244,44 @@ class TestNodetoHTML(unittest.TestCase):
             {"src": "https://example.com/bear.png", "alt": "A bear"},
         )
     
+    def test_nested(self):
+        node = TextNode("see docs", TextType.LINK, "/docs", [
+            TextNode("see ", TextType.TEXT),
+            TextNode("docs", TextType.BOLD),
+        ])
+        self.assertEqual(text_node_to_html_node(node).to_html(), '<a href="/docs">see <b>docs</b></a>')
+
     def test_bad_type_raises(self):
         node = TextNode("???", "not-a-real-type")
         with self.assertRaises(Exception):
             text_node_to_html_node(node)
 
+    def test_emitters_match_nodes(self):
+        nodes = [
+            TextNode("a < b & c", TextType.TEXT),
+            TextNode("bold", TextType.BOLD),
+            TextNode("it <i>", TextType.ITALIC),
+            TextNode("x > 1", TextType.CODE),
+            TextNode("see docs", TextType.LINK, '/docs?a=1&b="2"', [
+                TextNode("see ", TextType.TEXT),
+                TextNode("docs", TextType.BOLD, None, [TextNode("docs", TextType.ITALIC)]),
+            ]),
+            TextNode('a "bear"', TextType.IMAGE, "/bear.png"),
+        ]
+        expected = "".join(text_node_to_html_node(node).to_html() for node in nodes)
+        self.assertEqual(text_nodes_to_html(nodes), expected)
+
+    def test_emitter_bad_type_raises(self):
+        with self.assertRaises(ValueError):
+            text_nodes_to_html([TextNode("???", "not-a-real-type")])
+
+    def test_register_custom_type(self):
+        self.addCleanup(htmlnode._INLINE_RENDERERS.pop, "mark")
+        register_inline_type("mark", lambda node: LeafNode("mark", node.text))
+        node = TextNode("hit & miss", "mark")
+        self.assertEqual(text_node_to_html_node(node).to_html(), "<mark>hit &amp; miss</mark>")
+        self.assertEqual(text_nodes_to_html([node]), "<mark>hit &amp; miss</mark>")
+
 
 
 if __name__ == "__main__":
@@ -136,6 +136,23 @@ class TestSplitNodes(unittest.TestCase):
             new_nodes,
         )
     
+    def test_adjacent_links_and_images(self):
+        node = TextNode(
+            "[a](u1)[b](u2) ![c](u3)![d](u4)",
+            TextType.TEXT,
+        )
+        new_nodes = split_nodes_links(split_nodes_images([node]))
+        self.assertListEqual(
+            [
+                TextNode("a", TextType.LINK, "u1"),
+                TextNode("b", TextType.LINK, "u2"),
+                TextNode(" ", TextType.TEXT),
+                TextNode("c", TextType.IMAGE, "u3"),
+                TextNode("d", TextType.IMAGE, "u4"),
+            ],
+            new_nodes,
+        )
+
     def test_no_links_or_images(self):
         node = TextNode(
             "This is plain text without links or images.",
@@ -203,6 +220,45 @@ class TestTextToTextNodes(unittest.TestCase):
         ]
         self.assertEqual(result, expected)
 
+    def test_text_to_textnodes_nested(self):
+        result = text_to_textnodes("**bold _italic_** end")
+        expected = [
+            TextNode("bold italic", TextType.BOLD, None, [
+                TextNode("bold ", TextType.TEXT),
+                TextNode("italic", TextType.ITALIC),
+            ]),
+            TextNode(" end", TextType.TEXT),
+        ]
+        self.assertEqual(result, expected)
+
+    def test_text_to_textnodes_link_with_markup(self):
+        result = text_to_textnodes("[**docs** here](https://a.b/c*d*)")
+        expected = [
+            TextNode("docs here", TextType.LINK, "https://a.b/c*d*", [
+                TextNode("docs", TextType.BOLD),
+                TextNode(" here", TextType.TEXT),
+            ]),
+        ]
+        self.assertEqual(result, expected)
+
+    def test_text_to_textnodes_unmatched_delimiters_are_text(self):
+        for text in ["a * b", "**not closed", "`open code", "2 * 3 = 6 and 4*", "snake_case_name"]:
+            self.assertEqual(text_to_textnodes(text), [TextNode(text, TextType.TEXT)])
+
+    def test_text_to_textnodes_commonmark_emphasis(self):
+        self.assertEqual(
+            text_to_textnodes("**foo*"),
+            [TextNode("*", TextType.TEXT), TextNode("foo", TextType.ITALIC)],
+        )
+        self.assertEqual(
+            text_to_textnodes("***both***"),
+            [TextNode("both", TextType.ITALIC, None, [TextNode("both", TextType.BOLD)])],
+        )
+        self.assertEqual(
+            text_to_textnodes("foo*bar*"),
+            [TextNode("foo", TextType.TEXT), TextNode("bar", TextType.ITALIC)],
+        )
+
     def test_text_to_textnodes_no_special_formats(self):
         text = "Just a regular sentence without any special formatting."
         result = text_to_textnodes(text)
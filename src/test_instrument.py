@@ -0,0 +1,80 @@
+import io
+import json
+import unittest
+
+import blocks
+import instrument
+from blocks import markdown_to_html_node
+from htmlnode import HTMLNode
+
+
+MARKDOWN = "# Title\n\nSome **bold** and a [link](/x).\n\n- one\n- two"
+
+
+class TestInstrument(unittest.TestCase):
+    def tearDown(self):
+        instrument.disable()
+
+    def test_disabled_by_default_leaves_pipeline_untouched(self):
+        self.assertFalse(instrument.is_enabled())
+        self.assertFalse(hasattr(blocks.block_to_block_type, "__wrapped__"))
+        self.assertFalse(hasattr(HTMLNode.to_html, "__wrapped__"))
+
+    def test_enable_and_disable(self):
+        original = blocks.text_to_textnodes
+        instrument.enable()
+        self.assertIs(blocks.text_to_textnodes.__wrapped__, original)
+        instrument.disable()
+        self.assertIs(blocks.text_to_textnodes, original)
+
+    def test_counts_blocks_text_nodes_and_bytes(self):
+        instrument.enable()
+        html = markdown_to_html_node(MARKDOWN).to_html()
+        stats = instrument.stats()
+        self.assertEqual(stats.blocks, {"HEADING": 1, "PARAGRAPH": 1, "UNORDERED_LIST": 1})
+        self.assertEqual(stats.text_nodes, {"TEXT": 6, "BOLD": 1, "LINK": 1})
+        self.assertEqual(stats.calls["block_to_block_type"], 3)
+        self.assertEqual(stats.calls["text_nodes_to_children"], 4)
+        self.assertEqual(stats.bytes_emitted, len(html))
+
+    def test_stream(self):
+        chunks = ["<p>", "text", "</p>"]
+        self.assertIs(instrument.stream(chunks), chunks)
+        instrument.enable()
+        self.assertEqual("".join(instrument.stream(iter(chunks))), "<p>text</p>")
+        stats = instrument.stats()
+        self.assertEqual(stats.bytes_emitted, len("<p>text</p>"))
+        self.assertEqual(stats.calls["to_html"], 1)
+
+    def test_page_records(self):
+        instrument.enable()
+        with instrument.page("a.md"):
+            markdown_to_html_node(MARKDOWN).to_html()
+        with instrument.page("b.md"):
+            markdown_to_html_node("plain").to_html()
+        first, second = instrument.stats().pages
+        self.assertEqual(first["path"], "a.md")
+        self.assertEqual(first["blocks"], {"HEADING": 1, "PARAGRAPH": 1, "UNORDERED_LIST": 1})
+        self.assertEqual(second["blocks"], {"PARAGRAPH": 1})
+        self.assertEqual(second["bytes"], len("<div><p>plain</p></div>"))
+        report = instrument.format_report(top=1)
+        self.assertIn("slowest 1 of 2 pages", report)
+        buffer = io.StringIO()
+        instrument.dump(buffer)
+        data = json.loads(buffer.getvalue())
+        self.assertEqual([record["path"] for record in data["pages"]], ["a.md", "b.md"])
+        self.assertEqual(data["aggregate"]["blocks"], {"HEADING": 1, "PARAGRAPH": 2, "UNORDERED_LIST": 1})
+
+    def test_add_page_from_worker(self):
+        instrument.enable()
+        record = {"path": "c.md", "total": 1.0, "seconds": {"to_html": 0.5}, "calls": {"to_html": 1},
+                  "blocks": {"CODE": 2}, "text_nodes": {}, "bytes": 10}
+        instrument.add_page(record)
+        stats = instrument.stats()
+        self.assertEqual(stats.blocks["CODE"], 2)
+        self.assertEqual(stats.bytes_emitted, 10)
+        self.assertIn("c.md", instrument.format_report())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+from blocks import markdown_to_html_node
+from htmlnode import LeafNode, ParentNode
+from linkindex import LinkIndex, iter_references, resolve_url
+
+
+class TestResolveUrl(unittest.TestCase):
+    def test_external_and_anchors(self):
+        self.assertIsNone(resolve_url("index.html", "https://example.com/a"))
+        self.assertIsNone(resolve_url("index.html", "mailto:me@example.com"))
+        self.assertIsNone(resolve_url("index.html", "//cdn.example.com/x.js"))
+        self.assertIsNone(resolve_url("index.html", "#top"))
+
+    def test_site_paths(self):
+        self.assertEqual(resolve_url("blog/post.html", "/about?x=1#team"), "about")
+        self.assertEqual(resolve_url("blog/post.html", "other.html"), "blog/other.html")
+        self.assertEqual(resolve_url("blog/post.html", "../img/a.png"), "img/a.png")
+        self.assertEqual(resolve_url("blog/post.html", "/docs/"), "docs/")
+        self.assertEqual(resolve_url("blog/post.html", "/"), "")
+
+
+class TestLinkIndex(unittest.TestCase):
+    def make_index(self):
+        index = LinkIndex()
+        index.set_page("index.html", [("a", "/blog/"), ("a", "about"), ("img", "/logo.png")])
+        index.set_page("blog/index.html", [("a", "first"), ("a", "/missing"), ("a", "https://boot.dev")])
+        index.set_page("blog/first.html", [("a", "/"), ("a", "#top")])
+        index.set_page("about.html", [("a", "/about.html")])
+        index.set_files(["logo.png"])
+        return index
+
+    def test_iter_references(self):
+        node = ParentNode("div", [
+            ParentNode("p", [LeafNode("a", "one", {"href": "/one"}), LeafNode(None, "text")]),
+            LeafNode("img", "", {"src": "/a.png", "alt": "a"}),
+            LeafNode("a", "two", {"href": "/two"}),
+        ])
+        self.assertEqual(list(iter_references(node)), [("a", "/one"), ("img", "/a.png"), ("a", "/two")])
+
+    def test_iter_references_nested_in_markup(self):
+        node = markdown_to_html_node("See **the [guide](/guide)** and [the **docs**](/docs), _![x](/x.png)_.")
+        self.assertEqual(list(iter_references(node)), [("a", "/guide"), ("a", "/docs"), ("img", "/x.png")])
+
+    def test_queries(self):
+        index = self.make_index()
+        self.assertEqual(index.links_to("/blog"), ["index.html"])
+        self.assertEqual(index.links_to("/blog/first"), ["blog/index.html"])
+        self.assertEqual(index.links_to("/"), ["blog/first.html"])
+        self.assertEqual(index.links_to("/logo.png"), ["index.html"])
+        self.assertEqual(index.links_to("/nowhere"), [])
+        self.assertEqual(index.broken(), [("blog/index.html", "/missing")])
+        self.assertEqual(index.orphans(), [])
+
+    def test_self_links_do_not_count(self):
+        index = self.make_index()
+        index.set_page("index.html", [("a", "/blog/")])
+        self.assertEqual(index.orphans(), ["about.html"])
+        index.remove_page("blog/index.html")
+        self.assertEqual(index.orphans(), ["about.html", "blog/first.html"])
+
+    def test_save_and_load(self):
+        index = self.make_index()
+        with tempfile.TemporaryDirectory() as tmp:
+            index.save(tmp)
+            self.assertFalse(index.changed)
+            loaded = LinkIndex.load(tmp)
+            self.assertEqual(loaded.pages, index.pages)
+            self.assertEqual(loaded.files, index.files)
+            self.assertEqual(loaded.broken(), index.broken())
+            with open(os.path.join(tmp, ".links.json"), "w") as fp:
+                fp.write("{not json")
+            self.assertEqual(len(LinkIndex.load(tmp)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import random
+import time
+import unittest
+
+from blocks import RenderLimitError, markdown_to_html_node
+from inline import MAX_INLINE_NESTING, extract_markdown_images, extract_markdown_links, text_to_textnodes
+
+
+def render(markdown):
+    return markdown_to_html_node(markdown).to_html()
+
+
+def backtick_runs(size):
+    # Unclosed runs of every length: each one would rescan the rest of a naive matcher's input.
+    runs = []
+    total = 0
+    length = 1
+    while total < size:
+        runs.append("`" * length)
+        total += length + 1
+        length += 1
+    return " ".join(runs)
+
+
+ADVERSARIAL = {
+    "open brackets": lambda n: "[" * n,
+    "open images": lambda n: "![" * (n // 2),
+    "unclosed link targets": lambda n: "[a](" * (n // 4),
+    "backtick runs": backtick_runs,
+    "unmatched openers": lambda n: "*a _b " * (n // 6),
+    "unmatched closers": lambda n: "a* b_ " * (n // 6),
+    "rule of three": lambda n: "a**b*c " * (n // 7),
+    "deep nesting": lambda n: "*a " * (n // 6) + "b" + " c*" * (n // 6),
+    "long quote": lambda n: "> quoted **line**\n" * (n // 18),
+    "long list": lambda n: "- item *one*\n" * (n // 13),
+    "unclosed fence": lambda n: "```\n" + "code `x` *y*\n" * (n // 13),
+}
+
+FUZZ_PIECES = ["*", "**", "_", "__", "`", "``", "[", "]", "(", ")", "![", "](", "\n", "\n\n", "> ", "- ",
+               "1. ", "# ", "```", "a", "word", " ", "\\", "<", "&", "é"]
+
+
+class TestLinearScaling(unittest.TestCase):
+    SIZE = 20_000
+
+    def best_of(self, func, text, repeat=3):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(text)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def assert_linear(self, func, make):
+        # 4x the input must cost well under the 16x a quadratic algorithm would.
+        small = self.best_of(func, make(self.SIZE))
+        large = self.best_of(func, make(self.SIZE * 4))
+        self.assertLess(large, max(small, 0.002) * 10)
+
+    def test_render_scales_linearly(self):
+        for name, make in ADVERSARIAL.items():
+            with self.subTest(name):
+                self.assert_linear(render, make)
+
+    def test_extract_scales_linearly(self):
+        for name in ("open brackets", "open images", "unclosed link targets"):
+            with self.subTest(name):
+                make = ADVERSARIAL[name]
+                self.assert_linear(extract_markdown_links, make)
+                self.assert_linear(extract_markdown_images, make)
+
+
+class TestAdversarialInput(unittest.TestCase):
+    def test_fuzz_renders_without_errors(self):
+        rng = random.Random(22)
+        for _ in range(300):
+            markdown = "".join(rng.choice(FUZZ_PIECES) for _ in range(rng.randint(1, 200)))
+            html = render(markdown)
+            self.assertTrue(html.startswith("<div>"))
+
+    def test_nesting_is_capped(self):
+        depth = MAX_INLINE_NESTING * 10
+        nodes = text_to_textnodes("*a " * depth + "b" + " c*" * depth)
+        levels = 0
+        while nodes:
+            levels += 1
+            nodes = [child for node in nodes for child in node.children or ()]
+        self.assertLessEqual(levels, MAX_INLINE_NESTING + 2)
+        self.assertIn("*a *a", render("*a " * depth + "b" + " c*" * depth))
+
+    def test_max_chars(self):
+        markdown = "para one\n\npara two\n\npara three"
+        self.assertEqual(markdown_to_html_node(markdown, max_chars=100).to_html(), render(markdown))
+        with self.assertRaises(RenderLimitError):
+            markdown_to_html_node(markdown, max_chars=12)
+
+    def test_time_budget(self):
+        markdown = "\n\n".join(["text"] * 100)
+        with self.assertRaises(ValueError):
+            markdown_to_html_node(markdown, time_budget=-1)
+        self.assertEqual(markdown_to_html_node(markdown, time_budget=60).to_html(), render(markdown))
+
+
+if __name__ == "__main__":
+    unittest.main()
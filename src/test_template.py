@@ -0,0 +1,45 @@
+import io
+import unittest
+
+from htmlnode import LeafNode, ParentNode
+from template import Template, compile_template
+
+
+class TestTemplate(unittest.TestCase):
+    def test_compile(self):
+        template = Template("<title>{{ Title }}</title>{{Content}}<footer>")
+        self.assertEqual(template.literals, ["<title>", "</title>", "<footer>"])
+        self.assertEqual(template.slots, ["Title", "Content"])
+
+    def test_render(self):
+        template = Template("<h1>{{ Title }}</h1><main>{{ Content }}</main>")
+        self.assertEqual(
+            template.render({"Title": "Home", "Content": "<p>hi</p>"}),
+            "<h1>Home</h1><main><p>hi</p></main>",
+        )
+
+    def test_values_are_not_rescanned(self):
+        template = Template("{{ Title }}|{{ Content }}")
+        self.assertEqual(template.render({"Title": "{{ Content }}", "Content": "x"}), "{{ Content }}|x")
+
+    def test_missing_slot_is_kept(self):
+        template = Template("{{ Title }} {{  Unknown }}")
+        self.assertEqual(template.render({"Title": "T"}), "T {{  Unknown }}")
+
+    def test_streams_iterables(self):
+        node = ParentNode("div", [LeafNode("b", "bold"), LeafNode(None, " text")])
+        template = Template("<title>{{ Title }}</title>{{ Content }}<hr>{{ Content }}")
+        fp = io.StringIO()
+        template.write(fp, {"Title": "T", "Content": node.iter_html()}, buffer_size=4)
+        expected = "<title>T</title><div><b>bold</b> text</div><hr><div><b>bold</b> text</div>"
+        self.assertEqual(fp.getvalue(), expected)
+
+    def test_compile_template_is_cached(self):
+        text = "<p>{{ Content }}</p>"
+        template = compile_template(text)
+        self.assertIs(compile_template(text), template)
+        self.assertIs(compile_template(template), template)
+
+
+if __name__ == "__main__":
+    unittest.main()
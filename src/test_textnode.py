@@ -25,6 +25,12 @@ class TestTextNode(unittest.TestCase):
         node2 = TextNode("This is a different text node", TextType.BOLD)
         self.assertNotEqual(node,node2)
 
+    def test_no_instance_dict(self):
+        node = TextNode("text", TextType.LINK, "www.boot.dev")
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.extra = True
+
     def test_checkeq(self):
         node = TextNode("This is a text node", TextType.BOLD, "www.google.com")
         node2 = TextNode("wrongtext",TextType.LINK,"www.youtube.com")
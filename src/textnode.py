@@ -8,19 +8,30 @@ class TextType(Enum):
     LINK = "[Link text](url)"
     IMAGE = "![Image alt text](image url)"
 
+    # Members are singletons compared by identity, so the identity hash is consistent with
+    # equality and keeps Enum's Python-level __hash__ out of the renderer table lookups.
+    __hash__ = object.__hash__
+
 class TextNode:
-    def __init__(self,text,text_type,url =  None):
+    # Bold, italic and link nodes whose content has further markup keep it in children,
+    # a list of TextNodes; text is then the plain text of the whole subtree.
+    __slots__ = ("text", "text_type", "url", "children")
+
+    def __init__(self,text,text_type,url =  None, children=None):
         self.text = text
         self.text_type = text_type
         self.url = url
+        self.children = children
 
     def __eq__(self, other):
         if not isinstance(other, TextNode):
             return False
         return (self.text == other.text and
                 self.text_type == other.text_type and
-                self.url == other.url)
+                self.url == other.url and
+                self.children == other.children)
     
     def __repr__(self):
+        if self.children is not None:
+            return f"TextNode({self.text},{self.text_type},{self.url},{self.children})"
         return f"TextNode({self.text},{self.text_type},{self.url})"
-    
\ No newline at end of file